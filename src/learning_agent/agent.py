@@ -261,11 +261,12 @@ def create_learning_agent(
         storage_path = Path(".agent")
     storage_path.mkdir(parents=True, exist_ok=True)
 
-    # Initialize the LangMem learning system
-    from learning_agent.learning.langmem_integration import initialize_learning_system
+    # Initialize the LangMem learning system once per process; later agents
+    # share it (and its connection pool and pending reflections)
+    from learning_agent.learning.langmem_integration import get_learning_system
 
     # Don't pass storage_path as it's for filesystem, not database URL
-    initialize_learning_system()
+    get_learning_system()
 
     # Get model
     if model is None:
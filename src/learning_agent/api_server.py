@@ -1,6 +1,8 @@
 """API server for learning agent auxiliary tooling."""
 
+import base64
 import logging
+import os
 from typing import Any
 
 from fastapi import FastAPI, HTTPException
@@ -11,6 +13,13 @@ from pydantic import BaseModel
 from learning_agent.learning.langmem_integration import get_learning_system
 
 
+# Resolved once at import rather than on every file request
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore[assignment]
+
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -63,9 +72,11 @@ async def get_learnings() -> LearningsResponse:
 
         logger.info("Fetched %d learnings", len(memories))
 
-        return LearningsResponse(
+        # FastAPI validates the result against response_model; model_construct
+        # skips a second validation pass over every learning on each UI poll
+        return LearningsResponse.model_construct(
             learnings=[
-                LearningItem(
+                LearningItem.model_construct(
                     id=memory.get("id", ""),
                     task=memory.get("task", ""),
                     context=memory.get("context"),
@@ -127,13 +138,6 @@ async def get_file(file_path: str, thread_id: str | None = None) -> Response:
     Returns:
         File content with appropriate content type
     """
-    import base64
-
-    try:
-        import httpx
-    except ImportError:
-        httpx = None  # type: ignore[assignment]
-
     # Normalize the path
     normalized_path = file_path if file_path.startswith("/") else f"/{file_path}"
 
@@ -215,8 +219,6 @@ async def get_file(file_path: str, thread_id: str | None = None) -> Response:
 
 
 if __name__ == "__main__":
-    import os
-
     import uvicorn
 
     # In Docker, bind to all interfaces; locally bind to localhost
@@ -1,6 +1,7 @@
 """CLI entry point for the Learning Agent."""
 
 import asyncio
+from collections.abc import Coroutine
 from pathlib import Path
 from typing import Any
 
@@ -25,6 +26,15 @@ app = typer.Typer(
 console = Console()
 
 
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run ``coro`` to completion, on uvloop when the speedups extra is installed."""
+    try:
+        import uvloop
+    except ImportError:  # pragma: no cover - optional dependency (speedups extra)
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
+
 def version_callback(value: bool) -> None:
     """Show version and exit."""
     if value:
@@ -56,10 +66,10 @@ def main(
 
     if task:
         # Execute single task
-        asyncio.run(execute_task(task))
+        run_async(execute_task(task))
     else:
         # Enter interactive mode
-        asyncio.run(interactive_mode())
+        run_async(interactive_mode())
 
 
 async def execute_task(task: str) -> None:
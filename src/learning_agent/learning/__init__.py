@@ -1,6 +1,20 @@
 """Learning module - Natural language narrative learning with deep reflection."""
 
-from learning_agent.learning.narrative_learner import NarrativeLearner
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from learning_agent.learning.narrative_learner import NarrativeLearner
 
 
 __all__ = ["NarrativeLearner"]
+
+
+def __getattr__(name: str) -> Any:
+    # NarrativeLearner pulls in faiss and numpy; import it only when it is used
+    # so the agent and server (which load sibling modules) start faster
+    if name == "NarrativeLearner":
+        from learning_agent.learning.narrative_learner import NarrativeLearner
+
+        return NarrativeLearner
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,24 @@
 """Execution analyzer for extracting patterns and inefficiencies from agent runs."""
 
-import re
 from collections import Counter
 from typing import Any
 
 
+# Tool names detected in message content, in the order they are recorded
+TRACKED_TOOLS = (
+    "write_todos",
+    "read_file",
+    "write_file",
+    "edit_file",
+    "ls",
+    "python_sandbox",
+    "task",
+)
+
+# Tools whose consecutive calls could have run in parallel
+FILE_OPERATION_TOOLS = frozenset({"read_file", "write_file", "edit_file"})
+
+
 class ExecutionAnalyzer:
     """Analyzes execution traces to identify patterns, inefficiencies, and learning opportunities."""
 
@@ -41,8 +55,8 @@ class ExecutionAnalyzer:
         inefficiencies = self._identify_inefficiencies()
         parallelization = self._identify_parallel_opportunities()
 
-        # Calculate metrics
-        total_tool_calls = sum(self.tool_counts.values())
+        # Calculate metrics; every recorded call is one sequence entry
+        total_tool_calls = len(self.tool_sequence)
         unique_tools = len(self.tool_counts)
 
         return {
@@ -54,26 +68,20 @@ class ExecutionAnalyzer:
             "inefficiencies": inefficiencies,
             "parallelization_opportunities": parallelization,
             "execution_patterns": self._extract_patterns(),
-            "efficiency_score": self._calculate_efficiency_score(),
+            "efficiency_score": self._calculate_efficiency_score(
+                len(redundancies), len(inefficiencies), len(parallelization)
+            ),
         }
 
     def _extract_tool_calls(self, content: str) -> None:
         """Extract tool calls from message content."""
-        # Common tool patterns that remain in the agent
-        tool_patterns = [
-            r"write_todos",
-            r"read_file",
-            r"write_file",
-            r"edit_file",
-            r"ls",
-            r"python_sandbox",
-            r"task",
-        ]
-
-        for pattern in tool_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                self.tool_sequence.append(pattern)
-                self.tool_counts[pattern] += 1
+        # The names are plain literals: fold case once and use substring search
+        # rather than a case-insensitive regex search per name
+        folded = content.casefold()
+        for tool in TRACKED_TOOLS:
+            if tool in folded:
+                self.tool_sequence.append(tool)
+                self.tool_counts[tool] += 1
 
     def _identify_redundancies(self) -> list[dict[str, Any]]:
         """Identify redundant tool calls."""
@@ -113,7 +121,7 @@ class ExecutionAnalyzer:
             }
             for i in range(1, len(self.tool_sequence))
             if self.tool_sequence[i] == "ls"
-            and self.tool_sequence[i - 1] in ["write_todos"]
+            and self.tool_sequence[i - 1] == "write_todos"
         ]
         redundancies.extend(unnecessary_ls)
 
@@ -134,27 +142,29 @@ class ExecutionAnalyzer:
                 }
             )
 
-        # Check for read_file without prior ls or search
+        # Check for read_file without an ls among the three preceding calls.
+        # Tracking the last ls position avoids copying the prefix for every read;
+        # reads at positions 1 and 2 are always flagged, as before.
+        last_ls = -1
         for i, tool in enumerate(self.tool_sequence):
-            if tool == "read_file":
-                # Check if ls or search preceded it
-                prior_tools = self.tool_sequence[:i]
-                if "ls" not in prior_tools[-3:] if len(prior_tools) >= 3 else prior_tools:
-                    inefficiencies.append(
-                        {
-                            "type": "read_without_context",
-                            "position": i,
-                            "suggestion": "Use ls or grep before read_file to understand structure",
-                        }
-                    )
+            if tool == "ls":
+                last_ls = i
+            elif tool == "read_file" and i > 0 and (i < 3 or i - last_ls > 3):
+                inefficiencies.append(
+                    {
+                        "type": "read_without_context",
+                        "position": i,
+                        "suggestion": "Use ls or grep before read_file to understand structure",
+                    }
+                )
 
         # Check for multiple reads of same file (should cache)
-        read_patterns = [i for i, t in enumerate(self.tool_sequence) if t == "read_file"]
-        if len(read_patterns) > 2:
+        read_count = self.tool_counts["read_file"]
+        if read_count > 2:
             inefficiencies.append(
                 {
                     "type": "repeated_reads",
-                    "count": len(read_patterns),
+                    "count": read_count,
                     "suggestion": "Cache file contents instead of re-reading",
                 }
             )
@@ -166,7 +176,7 @@ class ExecutionAnalyzer:
         opportunities = []
 
         # Look for independent file operations that could be parallel
-        file_ops = ["read_file", "write_file", "edit_file"]
+        file_ops = FILE_OPERATION_TOOLS
         consecutive_file_ops = [
             (i, self.tool_sequence[i], self.tool_sequence[i + 1])
             for i in range(len(self.tool_sequence) - 1)
@@ -194,7 +204,7 @@ class ExecutionAnalyzer:
             "delegates_to_subagent": "task" in self.tool_counts,
             "uses_python_sandbox": "python_sandbox" in self.tool_counts,
             "dominant_tool": self.tool_counts.most_common(1)[0][0] if self.tool_counts else None,
-            "tool_diversity": len(self.tool_counts) / max(sum(self.tool_counts.values()), 1),
+            "tool_diversity": len(self.tool_counts) / max(len(self.tool_sequence), 1),
         }
 
         # Identify workflow pattern
@@ -207,24 +217,28 @@ class ExecutionAnalyzer:
 
         return patterns
 
-    def _calculate_efficiency_score(self) -> float:
+    def _calculate_efficiency_score(
+        self, redundancy_count: int, inefficiency_count: int, parallel_missed: int
+    ) -> float:
         """Calculate an efficiency score based on the analysis.
 
+        Args:
+            redundancy_count: Number of redundancies found
+            inefficiency_count: Number of inefficiencies found
+            parallel_missed: Number of missed parallelization opportunities
+
         Returns:
             Score from 0.0 (inefficient) to 1.0 (highly efficient)
         """
         score = 1.0
 
         # Deduct for redundancies
-        redundancy_count = len(self._identify_redundancies())
         score -= min(redundancy_count * 0.1, 0.3)
 
         # Deduct for inefficiencies
-        inefficiency_count = len(self._identify_inefficiencies())
         score -= min(inefficiency_count * 0.15, 0.3)
 
         # Deduct for missed parallelization
-        parallel_missed = len(self._identify_parallel_opportunities())
         score -= min(parallel_missed * 0.1, 0.2)
 
         # Bonus for good practices
@@ -3,9 +3,11 @@
 import asyncio
 import logging
 import os
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from copy import deepcopy
+from datetime import datetime
 from typing import Any
+from uuid import uuid4
 
 import httpx
 from langchain_core.messages import (
@@ -20,10 +22,23 @@ from langmem import ReflectionExecutor
 from pydantic import BaseModel, Field
 
 from learning_agent.config import settings
+from learning_agent.learning.execution_analyzer import ExecutionAnalyzer
 from learning_agent.learning.vector_storage import VectorLearningStorage
 from learning_agent.providers import get_chat_model
 
 
+# Columns read for the memories panel in the web UI
+UI_MEMORY_FIELDS = (
+    "task",
+    "context",
+    "narrative",
+    "reflection",
+    "confidence_score",
+    "outcome",
+    "timestamp",
+)
+
+
 class _NoopStore(BaseStore):
     """Minimal BaseStore implementation to satisfy ReflectionExecutor requirements."""
 
@@ -136,6 +151,11 @@ class LangMemLearningSystem:
 
         # Background reflection handling
         self._default_delay = float(os.getenv("LEARNING_BACKGROUND_DELAY", "30"))
+        # LangGraph server receiving UI memory updates; resolved once, not per memory
+        self._langgraph_url = os.environ.get(
+            "LANGGRAPH_SERVER_URL",
+            "http://localhost:2024" if os.environ.get("ENV") == "local" else "http://server:2024",
+        )
         self._executor = ReflectionExecutor(
             self._build_reflection_runnable(),
             store=_NoopStore(),
@@ -182,8 +202,6 @@ class LangMemLearningSystem:
             full_narrative = "\n".join(narrative_parts)
 
             # Analyze execution trace for inefficiencies
-            from learning_agent.learning.execution_analyzer import ExecutionAnalyzer
-
             analyzer = ExecutionAnalyzer()
             execution_analysis = analyzer.analyze_conversation(
                 [{"content": part} for part in narrative_parts]
@@ -242,9 +260,6 @@ Extract learnings only when they provide tangible value for future similar tasks
                     )
                     return
 
-                from datetime import datetime
-                from uuid import uuid4
-
                 metadata.setdefault("learning_signals", relevance_signals)
                 metadata.setdefault(
                     "learning_decision",
@@ -276,8 +291,11 @@ Extract learnings only when they provide tangible value for future similar tasks
                     "metadata": metadata,
                 }
 
-                memory_id = await self.storage.store_memory(memory)
-                memory["id"] = memory_id  # Update with actual stored ID
+                # Buffered write: learnings finishing together share one
+                # embeddings request and one batched upsert. The id is final
+                # immediately; storage.close() flushes anything still pending.
+                memory_id = await self.storage.queue_memory(memory)
+                memory["id"] = memory_id
 
                 # Update thread state with new memory for UI display
                 thread_id = metadata.get("thread_id")
@@ -286,7 +304,7 @@ Extract learnings only when they provide tangible value for future similar tasks
 
                 # Log for debugging
                 self._logger.info(
-                    f"Stored deep learning memory: {memory_id} - {memory['task']} "
+                    f"Queued deep learning memory: {memory_id} - {memory['task']} "
                     f"(confidence: {learning_result.confidence_score:.2f})"
                 )
 
@@ -300,13 +318,7 @@ Extract learnings only when they provide tangible value for future similar tasks
         without blocking the graph execution.
         """
         try:
-            # Get LangGraph server URL
-            langgraph_url = os.environ.get(
-                "LANGGRAPH_SERVER_URL",
-                "http://localhost:2024"
-                if os.environ.get("ENV") == "local"
-                else "http://server:2024",
-            )
+            langgraph_url = self._langgraph_url
 
             # Prepare simplified memory for UI display
             timestamp_val = memory.get("timestamp")
@@ -440,13 +452,17 @@ Extract learnings only when they provide tangible value for future similar tasks
 
         await self._submit_via_reflector(messages, metadata, delay_seconds)
 
-    async def get_recent_memories(self, limit: int = 10) -> list[dict[str, Any]]:
+    async def get_recent_memories(
+        self, limit: int = 10, fields: Sequence[str] | None = None
+    ) -> list[dict[str, Any]]:
         """Get recently processed memories from storage."""
-        return await self.storage.get_recent_memories(limit)
+        return await self.storage.get_recent_memories(limit, fields=fields)
 
-    async def search_memories(self, query: str, limit: int = 5) -> list[dict[str, Any]]:
+    async def search_memories(
+        self, query: str, limit: int = 5, fields: Sequence[str] | None = None
+    ) -> list[dict[str, Any]]:
         """Search memories using vector similarity."""
-        return await self.storage.search_similar_memories(query, limit)
+        return await self.storage.search_similar_memories(query, limit, fields=fields)
 
     async def search_similar_tasks(self, current_task: str, limit: int = 5) -> list[dict[str, Any]]:
         """Search for similar tasks and return their learnings."""
@@ -459,12 +475,13 @@ Extract learnings only when they provide tangible value for future similar tasks
             await self.storage.initialize()
 
         # Get recent memories from vector storage
-        memories = await self.get_recent_memories(limit=20)
+        memories = await self.get_recent_memories(limit=20, fields=UI_MEMORY_FIELDS)
 
         # Convert to UI format
         ui_memories: list[dict[str, Any]] = []
         for memory in memories:
             if isinstance(memory, dict):
+                timestamp = memory.get("timestamp")
                 ui_memories.append(
                     {
                         "id": memory.get("id", str(len(ui_memories))),
@@ -479,7 +496,7 @@ Extract learnings only when they provide tangible value for future similar tasks
                         ),  # Keep for backward compatibility
                         "confidence_score": memory.get("confidence_score", 0.5),
                         "outcome": memory.get("outcome", "success"),
-                        "timestamp": memory.get("timestamp", ""),
+                        "timestamp": timestamp.isoformat() if timestamp else "",
                         "embedding": None,  # Don't send raw embeddings to UI
                         "similarity": memory.get("similarity"),  # Include similarity if present
                     }
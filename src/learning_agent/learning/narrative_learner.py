@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import os
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Protocol, cast
@@ -60,6 +61,15 @@ else:
 
     traceable = cast("Any", _fallback_traceable)
 
+# Maximum number of task strings whose quick context is kept in memory
+QUICK_CONTEXT_CACHE_SIZE = 256
+
+# Executions waiting for deep reflection; further executions are dropped when full
+REFLECTION_QUEUE_MAX_SIZE = 100
+
+# Deep reflections run concurrently by the background processor
+REFLECTION_CONCURRENCY = 3
+
 
 class NarrativeMemory(BaseModel):
     """Structured output for narrative memory creation."""
@@ -75,6 +85,21 @@ class ReflectionOutput(BaseModel):
     reflection: str = Field(description="The deep reflection on the specific aspect")
 
 
+class AngleReflection(BaseModel):
+    """One reflection within a batched reflection response."""
+
+    angle: str = Field(description="The reflection angle, named exactly as in the request")
+    reflection: str = Field(description="The deep reflection on this angle")
+
+
+class ReflectionBatch(BaseModel):
+    """Structured output for several reflections answered in one call."""
+
+    reflections: list[AngleReflection] = Field(
+        description="One reflection per requested angle, in the order requested"
+    )
+
+
 class QueryEnrichment(BaseModel):
     """Structured output for query enrichment."""
 
@@ -131,9 +156,17 @@ class NarrativeLearner:
         self.vector_store: Any | None = None  # Initialize on first use
         self.memories: list[Any] = []  # Store narratives alongside vectors
 
+        # Structured-output runnables by schema; binding a schema is not free
+        self._structured_llms: dict[type[BaseModel], Any] = {}
+
+        # LRU cache of get_quick_context results, cleared whenever a memory is stored
+        self._quick_context_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
         # Queue for background reflection
-        self.reflection_queue: asyncio.Queue[Any] = asyncio.Queue()
+        self.reflection_queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=REFLECTION_QUEUE_MAX_SIZE)
         self.background_task: asyncio.Task[Any] | None = None
+        # Strong references to fire-and-forget learning tasks until they finish
+        self._learning_tasks: set[asyncio.Task[Any]] = set()
 
         # Load existing memories if any
         self._load_memories()
@@ -186,17 +219,37 @@ class NarrativeLearner:
             await self.background_task
 
     async def _process_reflection_queue(self) -> None:
-        """Process reflections in the background."""
+        """Process reflections in the background, REFLECTION_CONCURRENCY at a time.
+
+        Each reflection is handled as soon as it finishes, so one slow reflection
+        does not hold up the rest of the queue. A slot is taken before dequeuing,
+        which keeps waiting executions in the bounded queue. On shutdown the
+        reflections still running are awaited.
+        """
+        slots = asyncio.Semaphore(REFLECTION_CONCURRENCY)
+        in_flight: set[asyncio.Task[None]] = set()
         while True:
-            try:
-                task = await self.reflection_queue.get()
-                if task is None:  # Shutdown signal
-                    break
-                # Extract callbacks from task if present
-                callbacks = task.pop("callbacks", None) if isinstance(task, dict) else None
-                await self._deep_reflection(task, callbacks=callbacks)
-            except Exception as e:
-                print(f"Reflection error: {e}")
+            await slots.acquire()
+            task = await self.reflection_queue.get()
+            if task is None:  # Shutdown signal
+                slots.release()
+                break
+            reflection = asyncio.create_task(self._reflect_queued(task, slots))
+            in_flight.add(reflection)
+            reflection.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    async def _reflect_queued(self, task: Any, slots: asyncio.Semaphore) -> None:
+        """Run one queued deep reflection and free its concurrency slot."""
+        try:
+            # Extract callbacks from task if present
+            callbacks = task.pop("callbacks", None) if isinstance(task, dict) else None
+            await self._deep_reflection(task, callbacks=callbacks)
+        except Exception as e:
+            print(f"Reflection error: {e}")
+        finally:
+            slots.release()
 
     @traceable(name="create_narrative_memory", run_type="chain")
     async def create_narrative_memory(
@@ -222,7 +275,7 @@ Write a narrative memory of this experience. Include:
 
 Write this as a story I'm telling my future self - conversational, insightful, and honest about what happened."""
 
-        structured_llm = self.llm.with_structured_output(NarrativeMemory)
+        structured_llm = self._structured_llm(NarrativeMemory)
 
         config: RunnableConfig | None = {"callbacks": callbacks} if callbacks else None
         narrative_response = await structured_llm.ainvoke(narrative_prompt, config=config)
@@ -250,6 +303,7 @@ Write this as a story I'm telling my future self - conversational, insightful, a
         # Add to vector store
         self.vector_store.add(np.array([embedding_array]))
         self.memories.append(narrative)
+        self._quick_context_cache.clear()
 
         # Save to disk
         self._save_memories()
@@ -257,7 +311,8 @@ Write this as a story I'm telling my future self - conversational, insightful, a
     @traceable(name="deep_reflection", run_type="chain")
     async def _deep_reflection(self, execution_data: dict[str, Any], callbacks: Any = None) -> None:  # noqa: ARG002
         """Perform deep multi-angle reflection on an execution."""
-        reflections = []
+        # (angle, prompt) pairs; the reflections are independent of each other
+        prompts: list[tuple[str, str]] = []
 
         # Reflection 1: Order and Dependencies
         order_reflection_prompt = f"""Looking at this task execution sequence:
@@ -274,16 +329,7 @@ Reflect deeply on the order of operations:
 
 Tell me what you learned about task sequencing and dependencies."""
 
-        structured_llm = self.llm.with_structured_output(ReflectionOutput)
-        order_reflection = await structured_llm.ainvoke(order_reflection_prompt)
-        reflections.append(
-            (
-                "Order and Dependencies",
-                order_reflection.reflection
-                if isinstance(order_reflection, ReflectionOutput)
-                else str(order_reflection),
-            )
-        )
+        prompts.append(("Order and Dependencies", order_reflection_prompt))
 
         # Reflection 2: Tool Selection
         tool_reflection_prompt = f"""Examining the tools used in this execution:
@@ -301,16 +347,7 @@ Question every tool choice:
 
 Share your honest assessment of tool selection."""
 
-        structured_llm = self.llm.with_structured_output(ReflectionOutput)
-        tool_reflection = await structured_llm.ainvoke(tool_reflection_prompt)
-        reflections.append(
-            (
-                "Tool Selection",
-                tool_reflection.reflection
-                if isinstance(tool_reflection, ReflectionOutput)
-                else str(tool_reflection),
-            )
-        )
+        prompts.append(("Tool Selection", tool_reflection_prompt))
 
         # Reflection 3: Necessity and Efficiency
         efficiency_reflection_prompt = f"""Review this entire execution critically:
@@ -328,16 +365,7 @@ Question every single step:
 
 Be ruthless about unnecessary complexity."""
 
-        structured_llm = self.llm.with_structured_output(ReflectionOutput)
-        efficiency_reflection = await structured_llm.ainvoke(efficiency_reflection_prompt)
-        reflections.append(
-            (
-                "Efficiency",
-                efficiency_reflection.reflection
-                if isinstance(efficiency_reflection, ReflectionOutput)
-                else str(efficiency_reflection),
-            )
-        )
+        prompts.append(("Efficiency", efficiency_reflection_prompt))
 
         # Reflection 4: Failure Analysis (if applicable)
         if execution_data.get("outcome") != "success":
@@ -357,16 +385,7 @@ Dig deep into the failure:
 
 Give me your honest, detailed analysis of what went wrong."""
 
-            structured_llm = self.llm.with_structured_output(ReflectionOutput)
-            failure_reflection = await structured_llm.ainvoke(failure_reflection_prompt)
-            reflections.append(
-                (
-                    "Failure Analysis",
-                    failure_reflection.reflection
-                    if isinstance(failure_reflection, ReflectionOutput)
-                    else str(failure_reflection),
-                )
-            )
+            prompts.append(("Failure Analysis", failure_reflection_prompt))
 
         # Reflection 5: Generalization and Patterns
         generalization_reflection_prompt = f"""From this specific task execution:
@@ -384,16 +403,9 @@ Extract the general principles:
 
 Share the broader lessons that apply beyond this specific task."""
 
-        structured_llm = self.llm.with_structured_output(ReflectionOutput)
-        generalization_reflection = await structured_llm.ainvoke(generalization_reflection_prompt)
-        reflections.append(
-            (
-                "Generalization",
-                generalization_reflection.reflection
-                if isinstance(generalization_reflection, ReflectionOutput)
-                else str(generalization_reflection),
-            )
-        )
+        prompts.append(("Generalization", generalization_reflection_prompt))
+
+        reflections = await self._reflect_from_angles(prompts)
 
         # Synthesize all reflections into a unified narrative
         synthesis_prompt = f"""I've reflected on a task execution from multiple angles:
@@ -408,7 +420,7 @@ similar tasks in the future.
 Write it as advice to my future self - what to remember, what to do differently,
 and what wisdom was gained from this experience."""
 
-        structured_llm = self.llm.with_structured_output(NarrativeMemory)
+        structured_llm = self._structured_llm(NarrativeMemory)
         synthesis = await structured_llm.ainvoke(synthesis_prompt)
         unified_narrative = (
             synthesis.narrative if isinstance(synthesis, NarrativeMemory) else str(synthesis)
@@ -417,6 +429,56 @@ and what wisdom was gained from this experience."""
         # Store the synthesized learning
         await self._store_narrative(unified_narrative)
 
+    def _structured_llm(self, schema: type[BaseModel]) -> Any:
+        """Return the chat model bound to ``schema``, binding it on first use."""
+        structured_llm = self._structured_llms.get(schema)
+        if structured_llm is None:
+            structured_llm = self._structured_llms[schema] = self.llm.with_structured_output(schema)
+        return structured_llm
+
+    async def _reflect_from_angles(self, prompts: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        """Answer all (angle, prompt) reflection requests with one structured LLM call.
+
+        The prompts describe the same execution, so one request replaces a
+        round-trip per angle. Angles missing from the batched answer are asked
+        individually, concurrently.
+
+        Returns:
+            (angle, reflection) pairs in the order of ``prompts``
+        """
+        batch_prompt = "\n\n".join(
+            [
+                "Reflect on the same task execution from each of the following angles. "
+                "Answer every angle separately and in full, naming it exactly as given.",
+                *(f"## {angle}\n\n{prompt}" for angle, prompt in prompts),
+            ]
+        )
+        answered: dict[str, str] = {}
+        try:
+            batch = await self._structured_llm(ReflectionBatch).ainvoke(batch_prompt)
+        except Exception as e:
+            print(f"Batched reflection failed, reflecting per angle: {e}")
+        else:
+            if isinstance(batch, ReflectionBatch):
+                answered = {
+                    item.angle.strip().casefold(): item.reflection
+                    for item in batch.reflections
+                    if item.reflection.strip()
+                }
+
+        missing = [(angle, prompt) for angle, prompt in prompts if angle.casefold() not in answered]
+        if missing:
+            structured_llm = self._structured_llm(ReflectionOutput)
+            responses = await asyncio.gather(
+                *(structured_llm.ainvoke(prompt) for _, prompt in missing)
+            )
+            for (angle, _), response in zip(missing, responses, strict=True):
+                answered[angle.casefold()] = (
+                    response.reflection if isinstance(response, ReflectionOutput) else str(response)
+                )
+
+        return [(angle, answered[angle.casefold()]) for angle, _ in prompts]
+
     async def find_relevant_experiences(
         self, task: str, context: str | None, recent_memories: list[Any] | None = None
     ) -> str:
@@ -439,7 +501,7 @@ Describe:
 
 Write a rich description that will help me find similar past experiences."""
 
-        structured_llm = self.llm.with_structured_output(QueryEnrichment)
+        structured_llm = self._structured_llm(QueryEnrichment)
         enriched_query_response = await structured_llm.ainvoke(query_prompt)
         enriched_query = (
             enriched_query_response.enriched_query
@@ -476,7 +538,7 @@ Analyze these experiences and tell me:
 
 Give me actionable advice based on these past experiences, not just a summary."""
 
-            structured_llm = self.llm.with_structured_output(RelevanceAnalysis)
+            structured_llm = self._structured_llm(RelevanceAnalysis)
             relevance_analysis = await structured_llm.ainvoke(relevance_prompt)
             return str(
                 relevance_analysis.analysis
@@ -515,7 +577,7 @@ Tell me the story of my learning journey:
 
 Write this as honest advice to myself about my patterns and growth areas."""
 
-        structured_llm = self.llm.with_structured_output(PatternAnalysis)
+        structured_llm = self._structured_llm(PatternAnalysis)
         pattern_analysis = await structured_llm.ainvoke(pattern_prompt)
         meta_learning = (
             pattern_analysis.patterns
@@ -537,29 +599,57 @@ Write this as honest advice to myself about my patterns and growth areas."""
         callbacks: Any = None,  # noqa: ARG002
     ) -> None:
         """Queue an execution for deep background reflection."""
-        reflection_task = {
+        await self.reflection_queue.put(self._reflection_task(execution_data))
+
+    @staticmethod
+    def _reflection_task(execution_data: dict[str, Any]) -> dict[str, Any]:
+        """Build the reflection queue entry for an execution."""
+        return {
             "id": str(uuid4()),
             "timestamp": datetime.now().isoformat(),
             **execution_data,
         }
-        await self.reflection_queue.put(reflection_task)
 
     def schedule_post_execution_learning(
         self, execution_data: dict[str, Any], callbacks: Any = None
     ) -> None:
-        """Schedule learning after task execution with callback propagation."""
+        """Schedule learning after task execution with callback propagation.
+
+        Returns immediately: the narrative memory is written by a background
+        task and the deep reflection is handed to the bounded reflection queue
+        without awaiting. When that queue is full the reflection is skipped
+        rather than blocking the caller.
+        """
         # Create context-aware tasks that preserve callback chain
-        asyncio.create_task(self.create_narrative_memory(execution_data, callbacks=callbacks))  # noqa: RUF006
+        self._spawn_learning_task(self.create_narrative_memory(execution_data, callbacks=callbacks))
 
         # Queue for deep reflection
-        asyncio.create_task(self.queue_for_reflection(execution_data, callbacks=callbacks))  # noqa: RUF006
+        try:
+            self.reflection_queue.put_nowait(self._reflection_task(execution_data))
+        except asyncio.QueueFull:
+            print("Reflection queue full, skipping deep reflection for this execution")
 
         # Schedule pattern consolidation if we have enough memories
         if len(self.memories) > 0 and len(self.memories) % 10 == 0:
-            asyncio.create_task(self.consolidate_patterns(callbacks=callbacks))  # noqa: RUF006
+            self._spawn_learning_task(self.consolidate_patterns(callbacks=callbacks))
+
+    def _spawn_learning_task(self, coro: Any) -> None:
+        """Run ``coro`` in the background, keeping a reference until it completes."""
+        task = asyncio.create_task(coro)
+        self._learning_tasks.add(task)
+        task.add_done_callback(self._learning_tasks.discard)
 
     async def get_quick_context(self, task: str) -> dict[str, Any]:
-        """Get quick context without blocking."""
+        """Get quick context without blocking.
+
+        Results are cached per task string until the next memory is stored, so
+        repeated lookups skip the embedding request and index search.
+        """
+        cached = self._quick_context_cache.get(task)
+        if cached is not None:
+            self._quick_context_cache.move_to_end(task)
+            return dict(cached)
+
         # Check if we have memories to search
         if self.vector_store is not None and self.memories:
             try:
@@ -581,11 +671,15 @@ Write this as honest advice to myself about my patterns and growth areas."""
                         self.memories[i] for i in indices[0][:3] if i < len(self.memories)
                     ]
 
-                    return {
+                    quick_context = {
                         "has_prior_experience": True,
                         "recent_memories": recent_memories,
                         "confidence": confidence,
                     }
+                    self._quick_context_cache[task] = quick_context
+                    if len(self._quick_context_cache) > QUICK_CONTEXT_CACHE_SIZE:
+                        self._quick_context_cache.popitem(last=False)
+                    return dict(quick_context)
             except Exception as e:
                 print(f"Quick context error: {e}")
 
@@ -1,7 +1,25 @@
 """Provider abstraction layer for LLMs and embeddings."""
 
-from learning_agent.providers.embedding_factory import get_embeddings
-from learning_agent.providers.llm_factory import get_chat_model
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from learning_agent.providers.embedding_factory import get_embeddings
+    from learning_agent.providers.llm_factory import get_chat_model
 
 
 __all__ = ["get_chat_model", "get_embeddings"]
+
+
+def __getattr__(name: str) -> Any:
+    # Each factory pulls in langchain on import; load them on first use so
+    # processes that only need one of them (or neither) skip the other
+    if name == "get_chat_model":
+        from learning_agent.providers.llm_factory import get_chat_model
+
+        return get_chat_model
+    if name == "get_embeddings":
+        from learning_agent.providers.embedding_factory import get_embeddings
+
+        return get_embeddings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
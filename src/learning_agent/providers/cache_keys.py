@@ -0,0 +1,10 @@
+"""Helpers for building provider cache keys without holding raw credentials."""
+
+import hashlib
+
+
+def secret_digest(secret: str | None) -> str | None:
+    """Return a short digest of ``secret`` for use in cache keys."""
+    if secret is None:
+        return None
+    return hashlib.blake2b(secret.encode("utf-8"), digest_size=16).hexdigest()
@@ -1,8 +1,36 @@
 """Factory for creating provider-agnostic embedding models."""
 
-from typing import Any, cast
+from __future__ import annotations
 
-from langchain_core.embeddings import Embeddings
+import threading
+from typing import TYPE_CHECKING, Any, cast
+
+from learning_agent.providers.cache_keys import secret_digest
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from langchain_core.embeddings import Embeddings
+
+
+# Embeddings by resolved configuration, so a local HuggingFace model is loaded
+# from disk once and API clients keep their connection pools
+_EMBEDDINGS: dict[tuple[Any, ...], Embeddings] = {}
+# Serializes construction so concurrent workers with equal settings build once
+_EMBEDDINGS_LOCK = threading.Lock()
+
+# API key fields each provider reads, so cache keys only look up and digest
+# the credentials the selected provider actually uses
+_PROVIDER_API_KEY_FIELDS: dict[str, tuple[str, ...]] = {
+    "openai": ("openai_api_key",),
+    "azure-openai": ("azure_openai_api_key", "openai_api_key"),
+    "cohere": ("cohere_api_key",),
+    "huggingface": ("huggingface_api_key",),
+    "google-genai": ("google_api_key",),
+    "mistralai": ("mistral_api_key",),
+    "voyage": ("voyage_api_key",),
+}
 
 
 def get_embeddings(config: Any) -> Embeddings:
@@ -16,142 +44,178 @@ def get_embeddings(config: Any) -> Embeddings:
         config: Configuration object with embedding settings
 
     Returns:
-        Embeddings instance configured according to settings
+        Embeddings instance configured according to settings, shared between
+        callers whose settings resolve to the same model
 
     Raises:
         ValueError: If the embedding provider is not supported
         ImportError: If required provider package is not installed
     """
     embedding_provider = config.embedding_provider
-    embedding_model = getattr(config, "embedding_model", None)
+    cache_key = (
+        embedding_provider,
+        getattr(config, "embedding_model", None),
+        getattr(config, "ollama_base_url", None),
+        str(getattr(config, "learning_db_path", "")),
+        *(
+            secret_digest(getattr(config, field, None))
+            for field in _PROVIDER_API_KEY_FIELDS.get(embedding_provider or "openai", ())
+        ),
+    )
+    embeddings = _EMBEDDINGS.get(cache_key)
+    if embeddings is None:
+        with _EMBEDDINGS_LOCK:
+            embeddings = _EMBEDDINGS.get(cache_key)
+            if embeddings is None:
+                embeddings = _EMBEDDINGS[cache_key] = _build_embeddings(config)
+    return embeddings
+
+
+def _build_embeddings(config: Any) -> Embeddings:
+    """Instantiate the embeddings model selected by ``config``."""
+    embedding_provider = config.embedding_provider
+    # Default to OpenAI if no provider specified
+    builder = _EMBEDDING_BUILDERS.get(embedding_provider or "openai")
+    if builder is None:
+        raise ValueError(f"Unsupported embedding provider: {embedding_provider}")
+    return builder(config, getattr(config, "embedding_model", None))
 
-    # OpenAI embeddings
-    if embedding_provider == "openai":
-        from langchain_openai import OpenAIEmbeddings
 
-        api_key = getattr(config, "openai_api_key", None)
+def _openai_embeddings(config: Any, embedding_model: str | None) -> Embeddings:
+    from langchain_openai import OpenAIEmbeddings
 
-        model_name = embedding_model or "text-embedding-3-small"
+    api_key = getattr(config, "openai_api_key", None)
+    model_name = embedding_model or "text-embedding-3-small"
 
-        if api_key:
-            return OpenAIEmbeddings(model=model_name, openai_api_key=api_key)
-        return OpenAIEmbeddings(model=model_name)
+    if api_key:
+        return OpenAIEmbeddings(model=model_name, openai_api_key=api_key)
+    return OpenAIEmbeddings(model=model_name)
 
-    # Anthropic embeddings
-    if embedding_provider == "anthropic":
-        # Anthropic does not provide embeddings; surface a clear error.
-        raise ValueError("Anthropic embeddings are not supported.")
 
-    # Azure OpenAI embeddings
-    if embedding_provider == "azure-openai":
-        api_key = getattr(config, "azure_openai_api_key", None) or getattr(
-            config, "openai_api_key", None
-        )
+def _anthropic_embeddings(_config: Any, _embedding_model: str | None) -> Embeddings:
+    # Anthropic does not provide embeddings; surface a clear error.
+    raise ValueError("Anthropic embeddings are not supported.")
 
-        model_name = embedding_model or "text-embedding-ada-002"
-        if api_key:
-            return OpenAIEmbeddings(model=model_name, openai_api_key=api_key)
-        return OpenAIEmbeddings(model=model_name)
 
-    if embedding_provider == "cohere":
-        try:
-            from langchain_cohere import CohereEmbeddings
-        except ImportError as e:
-            raise ImportError(
-                "Please install langchain-cohere: pip install langchain-cohere"
-            ) from e
-
-        api_key = getattr(config, "cohere_api_key", None)
-        model_name = embedding_model or "embed-english-v3.0"
-        return cast("Embeddings", CohereEmbeddings(model=model_name, cohere_api_key=api_key))
-
-    if embedding_provider == "huggingface":
-        try:
-            from langchain_huggingface import HuggingFaceEmbeddings
-        except ImportError as e:
-            raise ImportError(
-                "Please install langchain-huggingface: pip install langchain-huggingface"
-            ) from e
+def _azure_openai_embeddings(config: Any, embedding_model: str | None) -> Embeddings:
+    from langchain_openai import OpenAIEmbeddings
 
-        api_key = getattr(config, "huggingface_api_key", None)
-        model_name = embedding_model or "sentence-transformers/all-MiniLM-L6-v2"
-
-        # Check if using local or API-based
-        if api_key:
-            # Using HuggingFace Hub API
-            try:
-                from langchain_huggingface import HuggingFaceEndpointEmbeddings
-            except ImportError as e:  # pragma: no cover - optional dependency
-                raise ImportError(
-                    "Please install langchain-huggingface: pip install langchain-huggingface"
-                ) from e
-            return cast(
-                "Embeddings",
-                HuggingFaceEndpointEmbeddings(model=model_name, huggingfacehub_api_token=api_key),
-            )
-        # Using local model
-        return cast(
-            "Embeddings",
-            HuggingFaceEmbeddings(
-                model_name=model_name, cache_folder=str(config.learning_db_path / "models")
-            ),
-        )
+    api_key = getattr(config, "azure_openai_api_key", None) or getattr(
+        config, "openai_api_key", None
+    )
+    model_name = embedding_model or "text-embedding-ada-002"
 
-    if embedding_provider == "ollama":
-        try:
-            from langchain_ollama import OllamaEmbeddings
-        except ImportError as e:
-            raise ImportError(
-                "Please install langchain-ollama: pip install langchain-ollama"
-            ) from e
+    if api_key:
+        return OpenAIEmbeddings(model=model_name, openai_api_key=api_key)
+    return OpenAIEmbeddings(model=model_name)
 
-        model_name = embedding_model or "llama2"
-        base_url = getattr(config, "ollama_base_url", "http://localhost:11434")
 
-        return cast("Embeddings", OllamaEmbeddings(model=model_name, base_url=base_url))
+def _cohere_embeddings(config: Any, embedding_model: str | None) -> Embeddings:
+    try:
+        from langchain_cohere import CohereEmbeddings
+    except ImportError as e:
+        raise ImportError("Please install langchain-cohere: pip install langchain-cohere") from e
 
-    if embedding_provider == "google-genai":
-        try:
-            from langchain_google_genai import GoogleGenerativeAIEmbeddings
-        except ImportError as e:
-            raise ImportError(
-                "Please install langchain-google-genai: pip install langchain-google-genai"
-            ) from e
+    api_key = getattr(config, "cohere_api_key", None)
+    model_name = embedding_model or "embed-english-v3.0"
+    return cast("Embeddings", CohereEmbeddings(model=model_name, cohere_api_key=api_key))
 
-        api_key = getattr(config, "google_api_key", None)
-        model_name = embedding_model or "models/embedding-001"
-        return cast(
-            "Embeddings", GoogleGenerativeAIEmbeddings(model=model_name, google_api_key=api_key)
-        )
 
-    if embedding_provider == "mistralai":
-        try:
-            from langchain_mistralai import MistralAIEmbeddings
-        except ImportError as e:
-            raise ImportError(
-                "Please install langchain-mistralai: pip install langchain-mistralai"
-            ) from e
+def _huggingface_embeddings(config: Any, embedding_model: str | None) -> Embeddings:
+    try:
+        from langchain_huggingface import HuggingFaceEmbeddings
+    except ImportError as e:
+        raise ImportError(
+            "Please install langchain-huggingface: pip install langchain-huggingface"
+        ) from e
 
-        api_key = getattr(config, "mistral_api_key", None)
-        model_name = embedding_model or "mistral-embed"
-        return cast("Embeddings", MistralAIEmbeddings(model=model_name, api_key=api_key))
+    api_key = getattr(config, "huggingface_api_key", None)
+    model_name = embedding_model or "sentence-transformers/all-MiniLM-L6-v2"
 
-    if embedding_provider == "voyage":
+    # Check if using local or API-based
+    if api_key:
+        # Using HuggingFace Hub API
         try:
-            from langchain_voyageai import VoyageEmbeddings
-        except ImportError as e:
+            from langchain_huggingface import HuggingFaceEndpointEmbeddings
+        except ImportError as e:  # pragma: no cover - optional dependency
             raise ImportError(
-                "Please install langchain-voyageai: pip install langchain-voyageai"
+                "Please install langchain-huggingface: pip install langchain-huggingface"
             ) from e
-
-        api_key = getattr(config, "voyage_api_key", None)
-        model_name = embedding_model or "voyage-2"
-        return cast("Embeddings", VoyageEmbeddings(model=model_name, api_key=api_key))
-
-    # Default to OpenAI if no provider specified
-    if not embedding_provider:
-        from langchain_openai import OpenAIEmbeddings
-
-        return OpenAIEmbeddings(model="text-embedding-3-small")
-
-    raise ValueError(f"Unsupported embedding provider: {embedding_provider}")
+        return cast(
+            "Embeddings",
+            HuggingFaceEndpointEmbeddings(model=model_name, huggingfacehub_api_token=api_key),
+        )
+    # Using local model
+    return cast(
+        "Embeddings",
+        HuggingFaceEmbeddings(
+            model_name=model_name, cache_folder=str(config.learning_db_path / "models")
+        ),
+    )
+
+
+def _ollama_embeddings(config: Any, embedding_model: str | None) -> Embeddings:
+    try:
+        from langchain_ollama import OllamaEmbeddings
+    except ImportError as e:
+        raise ImportError("Please install langchain-ollama: pip install langchain-ollama") from e
+
+    model_name = embedding_model or "llama2"
+    base_url = getattr(config, "ollama_base_url", "http://localhost:11434")
+
+    return cast("Embeddings", OllamaEmbeddings(model=model_name, base_url=base_url))
+
+
+def _google_genai_embeddings(config: Any, embedding_model: str | None) -> Embeddings:
+    try:
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+    except ImportError as e:
+        raise ImportError(
+            "Please install langchain-google-genai: pip install langchain-google-genai"
+        ) from e
+
+    api_key = getattr(config, "google_api_key", None)
+    model_name = embedding_model or "models/embedding-001"
+    return cast(
+        "Embeddings", GoogleGenerativeAIEmbeddings(model=model_name, google_api_key=api_key)
+    )
+
+
+def _mistralai_embeddings(config: Any, embedding_model: str | None) -> Embeddings:
+    try:
+        from langchain_mistralai import MistralAIEmbeddings
+    except ImportError as e:
+        raise ImportError(
+            "Please install langchain-mistralai: pip install langchain-mistralai"
+        ) from e
+
+    api_key = getattr(config, "mistral_api_key", None)
+    model_name = embedding_model or "mistral-embed"
+    return cast("Embeddings", MistralAIEmbeddings(model=model_name, api_key=api_key))
+
+
+def _voyage_embeddings(config: Any, embedding_model: str | None) -> Embeddings:
+    try:
+        from langchain_voyageai import VoyageEmbeddings
+    except ImportError as e:
+        raise ImportError(
+            "Please install langchain-voyageai: pip install langchain-voyageai"
+        ) from e
+
+    api_key = getattr(config, "voyage_api_key", None)
+    model_name = embedding_model or "voyage-2"
+    return cast("Embeddings", VoyageEmbeddings(model=model_name, api_key=api_key))
+
+
+# Builder per provider name; each imports its provider package on first use
+_EMBEDDING_BUILDERS: dict[str, Callable[[Any, str | None], Embeddings]] = {
+    "openai": _openai_embeddings,
+    "anthropic": _anthropic_embeddings,
+    "azure-openai": _azure_openai_embeddings,
+    "cohere": _cohere_embeddings,
+    "huggingface": _huggingface_embeddings,
+    "ollama": _ollama_embeddings,
+    "google-genai": _google_genai_embeddings,
+    "mistralai": _mistralai_embeddings,
+    "voyage": _voyage_embeddings,
+}
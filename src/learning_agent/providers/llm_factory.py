@@ -1,10 +1,34 @@
 """Factory for creating provider-agnostic chat models."""
 
+import threading
 from typing import Any, cast
 
 from langchain.chat_models import init_chat_model
 from langchain_core.language_models import BaseChatModel
 
+from learning_agent.providers.cache_keys import secret_digest
+
+
+# Chat models by resolved configuration. Models are stateless between calls,
+# so every component with the same settings shares one instance (and its HTTP
+# connection pool) instead of building its own client.
+_CHAT_MODELS: dict[tuple[Any, ...], BaseChatModel] = {}
+# Serializes construction so concurrent workers with equal settings build once
+_CHAT_MODELS_LOCK = threading.Lock()
+
+# Map provider names to their expected API key field names; Ollama doesn't
+# need an API key
+_PROVIDER_API_KEY_FIELDS = {
+    "openai": "openai_api_key",
+    "anthropic": "anthropic_api_key",
+    "google-genai": "google_api_key",
+    "mistralai": "mistral_api_key",
+    "groq": "groq_api_key",
+    "together": "together_api_key",
+    "fireworks": "fireworks_api_key",
+    "cohere": "cohere_api_key",
+}
+
 
 def get_chat_model(config: Any) -> BaseChatModel:
     """
@@ -17,7 +41,8 @@ def get_chat_model(config: Any) -> BaseChatModel:
         config: Settings object containing LLM configuration
 
     Returns:
-        BaseChatModel: Provider-agnostic chat model instance
+        BaseChatModel: Provider-agnostic chat model instance, shared between
+            callers whose settings resolve to the same model
 
     Supported providers:
         - openai: Uses OpenAI's GPT models
@@ -30,28 +55,16 @@ def get_chat_model(config: Any) -> BaseChatModel:
         - fireworks: Uses Fireworks AI's API
         - cohere: Uses Cohere's models
     """
-    # Map provider names to their expected API key field names
-    api_key_mapping = {
-        "openai": config.openai_api_key,
-        "anthropic": config.anthropic_api_key,
-        "google-genai": getattr(config, "google_api_key", None),
-        "mistralai": getattr(config, "mistral_api_key", None),
-        "groq": getattr(config, "groq_api_key", None),
-        "together": getattr(config, "together_api_key", None),
-        "fireworks": getattr(config, "fireworks_api_key", None),
-        "cohere": getattr(config, "cohere_api_key", None),
-        "ollama": None,  # Ollama doesn't need an API key
-    }
-
     # Get the appropriate API key for the provider
-    api_key = api_key_mapping.get(config.llm_provider)
+    api_key_field = _PROVIDER_API_KEY_FIELDS.get(config.llm_provider)
+    api_key = getattr(config, api_key_field, None) if api_key_field else None
 
     # Handle generic api_key field as fallback
     if api_key is None and config.llm_provider != "ollama":
         api_key = getattr(config, "api_key", None)
 
     # Prepare model kwargs
-    model_kwargs = {
+    model_kwargs: dict[str, Any] = {
         "temperature": config.llm_temperature,
         "max_tokens": config.llm_max_tokens,
     }
@@ -68,6 +81,26 @@ def get_chat_model(config: Any) -> BaseChatModel:
         # Remove api_key from kwargs if present
         model_kwargs.pop("api_key", None)
 
+    cache_key = (
+        config.llm_provider,
+        config.llm_model,
+        model_kwargs["temperature"],
+        model_kwargs["max_tokens"],
+        model_kwargs.get("base_url"),
+        secret_digest(model_kwargs.get("api_key")),
+        secret_digest(config.openai_api_key),  # used by the fallback path
+    )
+    cached = _CHAT_MODELS.get(cache_key)
+    if cached is None:
+        with _CHAT_MODELS_LOCK:
+            cached = _CHAT_MODELS.get(cache_key)
+            if cached is None:
+                cached = _CHAT_MODELS[cache_key] = _init_chat_model(config, model_kwargs)
+    return cached
+
+
+def _init_chat_model(config: Any, model_kwargs: dict[str, Any]) -> BaseChatModel:
+    """Initialize the configured chat model, falling back to OpenAI on failure."""
     # Initialize the chat model using LangChain's factory
     try:
         model = cast(
@@ -2,9 +2,41 @@
 
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import json
+import logging
+import marshal
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 
+if TYPE_CHECKING:
+    import httpx
+
+
+logger = logging.getLogger(__name__)
+
+# Compiled API classes by tool schema, so sandbox start-up skips codegen and
+# compilation for servers whose tools have not changed
+API_CODE_CACHE_DIR = Path.home() / ".cache" / "learning_agent" / "mcp_api"
+
+
+# Python type hints for non-container JSON Schema types
+JSON_SCHEMA_SCALAR_TYPES = {
+    "string": "str",
+    "integer": "int",
+    "number": "float",
+    "boolean": "bool",
+    "object": "dict[str, Any]",
+}
+
+
+@functools.lru_cache(maxsize=512)
 def snake_to_pascal(snake_str: str) -> str:
     """Convert snake_case to PascalCase.
 
@@ -35,21 +67,13 @@ def json_schema_to_python_type(schema: dict[str, Any], required: bool = False) -
     if enum:
         enum_values = ", ".join(f'"{v}"' for v in enum)
         type_hint = f"Literal[{enum_values}]"
-    # Handle basic types
-    elif schema_type == "string":
-        type_hint = "str"
-    elif schema_type == "integer":
-        type_hint = "int"
-    elif schema_type == "number":
-        type_hint = "float"
-    elif schema_type == "boolean":
-        type_hint = "bool"
     elif schema_type == "array":
         items = schema.get("items", {})
         item_type = json_schema_to_python_type(items, required=True)
         type_hint = f"list[{item_type}]"
-    elif schema_type == "object":
-        type_hint = "dict[str, Any]"
+    # Handle basic types; "type" may also be a list, which maps to Any
+    elif isinstance(schema_type, str):
+        type_hint = JSON_SCHEMA_SCALAR_TYPES.get(schema_type, "Any")
     else:
         type_hint = "Any"
 
@@ -131,22 +155,28 @@ def generate_method_body(tool: dict[str, Any]) -> str:
     name = tool.get("name", "unknown_tool")
     schema = tool.get("inputSchema", {})
     properties = schema.get("properties", {})
+    required_params = set(schema.get("required", []))
 
-    # Build arguments dictionary
-    args_lines = [f'"{param_name}": {param_name}' for param_name in properties]
+    # Required arguments always go into the dict literal; optional ones are
+    # only added when given, so no per-call None filtering is needed
+    required_args = [f'"{param}": {param}' for param in properties if param in required_params]
+    optional_params = [param for param in properties if param not in required_params]
 
-    if args_lines:
-        args_dict = "{\n            " + ",\n            ".join(args_lines) + "\n        }"
+    if required_args:
+        args_dict = "{\n            " + ",\n            ".join(required_args) + "\n        }"
     else:
         args_dict = "{}"
 
-    # Remove None values from arguments
-    body = f"""arguments = {args_dict}
-        # Remove None values
-        arguments = {{k: v for k, v in arguments.items() if v is not None}}
-        return await self._client.call_tool("{name}", arguments)"""
+    if not optional_params:
+        return f'return await self._client.call_tool("{name}", {args_dict})'
 
-    return body
+    lines = [f"arguments = {args_dict}"]
+    for param in optional_params:
+        lines.append(f"if {param} is not None:")
+        lines.append(f'    arguments["{param}"] = {param}')
+    lines.append(f'return await self._client.call_tool("{name}", arguments)')
+
+    return "\n        ".join(lines)
 
 
 def generate_method(tool: dict[str, Any]) -> str:
@@ -189,7 +219,7 @@ async def generate_api_class(server_name: str, server_url: str, tools: list[dict
     class_name = snake_to_pascal(server_name) + "API"
 
     # Start class definition
-    class_code = f'''"""Auto-generated API for {server_name} MCP server."""
+    header = f'''"""Auto-generated API for {server_name} MCP server."""
 
 from __future__ import annotations
 
@@ -197,10 +227,7 @@ from typing import Any, Literal
 
 
 class {class_name}:
-    """Remote MCP: {server_url}
-
-    Auto-generated API from MCP tool schemas.
-    """
+    """Remote MCP: {server_url}"""
 
     def __init__(self, client: Any):
         """Initialize API with MCP client.
@@ -212,16 +239,89 @@ class {class_name}:
 
 '''
 
-    # Generate method for each tool
+    # Generate method for each tool and join once; appending to a growing
+    # string copies it per tool, which is quadratic for large catalogs
+    parts = [header]
     for tool in tools:
-        class_code += generate_method(tool)
-        class_code += "\n"
+        parts.append(generate_method(tool))
+        parts.append("\n")
+
+    return "".join(parts)
+
+
+@functools.cache
+def _generator_digest() -> bytes | None:
+    """Hash this module's source so any generator change invalidates cached classes.
 
-    return class_code
+    Returns None when the source cannot be read (e.g. a zipped install), which
+    disables the bytecode cache rather than risk loading stale classes.
+    """
+    try:
+        source = Path(__file__).read_bytes()
+    except OSError:
+        return None
+    return hashlib.blake2b(source, digest_size=16).digest()
+
+
+def _api_cache_path(server_name: str, server_url: str, tools: list[dict[str, Any]]) -> Path | None:
+    """Return the bytecode cache file for a generated API class, or None if uncacheable.
+
+    The key covers the interpreter's bytecode magic, the generator source and
+    the server's tool schema, so a change to any of them misses the cache.
+    """
+    generator_digest = _generator_digest()
+    if generator_digest is None:
+        return None
+    fingerprint = json.dumps([server_name, server_url, tools], sort_keys=True, default=str)
+    digest = hashlib.blake2b(
+        importlib.util.MAGIC_NUMBER + generator_digest + fingerprint.encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+    return API_CODE_CACHE_DIR / f"{digest}.pyc"
+
+
+async def load_api_class(server_name: str, server_url: str, tools: list[dict[str, Any]]) -> type:
+    """Return the API class for a server, reusing cached bytecode when possible.
+
+    Args:
+        server_name: Name of the MCP server (e.g., 'browser')
+        server_url: Base URL of remote MCP server
+        tools: List of tool definitions from server
+
+    Returns:
+        The generated ``{ServerName}API`` class
+    """
+    class_name = snake_to_pascal(server_name) + "API"
+    cache_path = _api_cache_path(server_name, server_url, tools)
+
+    code = None
+    if cache_path is not None:
+        with contextlib.suppress(OSError, ValueError, EOFError, TypeError):
+            code = marshal.loads(cache_path.read_bytes())  # nosec B302 - written below
+
+    if code is None:
+        source = await generate_api_class(server_name, server_url, tools)
+        code = compile(source, f"<{class_name}>", "exec")
+        if cache_path is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                # Write then rename so concurrent sandboxes never read a partial file
+                tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+                tmp_path.write_bytes(marshal.dumps(code))
+                tmp_path.replace(cache_path)
+            except OSError as e:
+                logger.debug(f"Could not cache generated API for {server_name}: {e}")
+
+    namespace: dict[str, Any] = {}
+    exec(code, namespace)  # nosec B102 - Generated code is trusted
+    return namespace[class_name]
 
 
 async def generate_api_from_remote(
-    server_name: str, server_url: str, auth_token: str | None = None
+    server_name: str,
+    server_url: str,
+    auth_token: str | None = None,
+    http_client: httpx.AsyncClient | None = None,
 ) -> str:
     """Generate Python API class from remote MCP server.
 
@@ -229,6 +329,7 @@ async def generate_api_from_remote(
         server_name: Name to use for the API (e.g., 'browser')
         server_url: Base URL of remote MCP server
         auth_token: Optional authentication token
+        http_client: Optional shared HTTP client to fetch the tools with
 
     Returns:
         Python source code for API class
@@ -242,8 +343,32 @@ async def generate_api_from_remote(
     from learning_agent.sandbox.remote_mcp_client import RemoteMCPClient
 
     # Connect to remote server and fetch tools
-    client = RemoteMCPClient(server_url, auth_token)
-    tools = await client.list_tools()
+    async with RemoteMCPClient(server_url, auth_token, http_client=http_client) as client:
+        tools = await client.list_tools()
 
     # Generate API class
     return await generate_api_class(server_name, server_url, tools)
+
+
+async def generate_apis(servers: list[tuple[str, str, str | None]]) -> dict[str, str]:
+    """Generate API classes for several remote MCP servers concurrently.
+
+    All servers are queried at once over one shared HTTP client, so the
+    total latency is that of the slowest server rather than the sum.
+
+    Args:
+        servers: (server_name, server_url, auth_token) for each server
+
+    Returns:
+        Mapping of server_name → Python source code for its API class
+    """
+    from learning_agent.sandbox.mcp_http_bridge import create_http_client
+
+    async with create_http_client() as http_client:
+        sources = await asyncio.gather(
+            *(
+                generate_api_from_remote(name, url, token, http_client=http_client)
+                for name, url, token in servers
+            )
+        )
+    return {name: source for (name, _, _), source in zip(servers, sources, strict=True)}
@@ -2,15 +2,39 @@
 
 from __future__ import annotations
 
+import asyncio
+import importlib.util
 import logging
 import os
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import httpx
 
 
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency (speedups extra)
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+# HTTP methods the bridge forwards to remote servers
+PROXY_METHODS = frozenset({"GET", "POST"})
+
+# Tool calls fan out to a handful of hosts; keep their connections warm and
+# multiplex them over HTTP/2 when h2 (speedups extra) is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+HTTP_LIMITS = httpx.Limits(max_connections=128, max_keepalive_connections=32, keepalive_expiry=60.0)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create an HTTP client tuned for proxying MCP requests."""
+    return httpx.AsyncClient(http2=HTTP2_AVAILABLE, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+
 
 class MCPHttpBridge:
     """Proxy HTTP requests from sandbox to remote MCP servers.
@@ -19,16 +43,41 @@ class MCPHttpBridge:
     the Pyodide sandbox before forwarding to remote MCP servers.
     """
 
-    def __init__(self, allowed_servers: dict[str, dict[str, Any]]):
+    def __init__(
+        self,
+        allowed_servers: dict[str, dict[str, Any]],
+        http_client: httpx.AsyncClient | None = None,
+    ):
         """Initialize MCP HTTP bridge.
 
         Args:
             allowed_servers: Mapping of server_name → config
                 Example: {'browser': {'url': 'https://...', 'auth': {...}}}
+            http_client: Optional client to share a connection pool with other
+                bridges; the caller keeps ownership and closes it
         """
         self.allowed_servers = allowed_servers
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or create_http_client()
         self.server_clients: dict[str, Any] = {}
+        # Auth token per server; env-provided tokens are read once, not per request
+        self._auth_tokens: dict[str, str | None] = {}
+        # (base_url, headers) per server, resolved once from config and auth
+        self._endpoints: dict[str, tuple[str, dict[str, str]]] = {}
+
+    def reload_config(self, allowed_servers: dict[str, dict[str, Any]] | None = None) -> None:
+        """Drop resolved tokens, endpoints and clients so config is read again.
+
+        Call this after changing server config or rotating token env vars.
+
+        Args:
+            allowed_servers: Optional replacement server mapping
+        """
+        if allowed_servers is not None:
+            self.allowed_servers = allowed_servers
+        self._auth_tokens.clear()
+        self._endpoints.clear()
+        self.server_clients.clear()
 
     async def get_server_config(self, server_name: str) -> dict[str, Any]:
         """Get configuration for a server.
@@ -70,6 +119,37 @@ class MCPHttpBridge:
 
         return None
 
+    def _server_auth_token(self, server_name: str, config: dict[str, Any]) -> str | None:
+        """Return the cached auth token for a server, resolving it on first use."""
+        if server_name not in self._auth_tokens:
+            self._auth_tokens[server_name] = self._get_auth_token(config.get("auth"))
+        return self._auth_tokens[server_name]
+
+    async def _resolve_endpoint(self, server_name: str) -> tuple[str, dict[str, str]]:
+        """Return the base URL and request headers for a server.
+
+        Args:
+            server_name: Name of the server
+
+        Returns:
+            Tuple of (base_url without trailing slash, headers)
+
+        Raises:
+            ValueError: If server is not in allowed list
+        """
+        endpoint = self._endpoints.get(server_name)
+        if endpoint is None:
+            config = await self.get_server_config(server_name)
+            auth_token = self._server_auth_token(server_name, config)
+            headers = {
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            }
+            if auth_token:
+                headers["Authorization"] = f"Bearer {auth_token}"
+            endpoint = self._endpoints[server_name] = (config["url"].rstrip("/"), headers)
+        return endpoint
+
     async def connect_server(self, server_name: str) -> Any:
         """Connect to a remote MCP server and return client.
 
@@ -89,14 +169,13 @@ class MCPHttpBridge:
         # Get server config
         config = await self.get_server_config(server_name)
         base_url = config["url"]
-        auth_config = config.get("auth")
-        auth_token = self._get_auth_token(auth_config)
+        auth_token = self._server_auth_token(server_name, config)
 
         # Import here to avoid circular dependency
         from learning_agent.sandbox.remote_mcp_client import RemoteMCPClient
 
-        # Create client
-        client = RemoteMCPClient(base_url, auth_token)
+        # Create client on the bridge's connection pool
+        client = RemoteMCPClient(base_url, auth_token, http_client=self.http_client)
 
         # Cache client
         self.server_clients[server_name] = client
@@ -127,32 +206,23 @@ class MCPHttpBridge:
             ValueError: If server not allowed
             httpx.HTTPError: If request fails
         """
-        # Validate server is allowed
-        config = await self.get_server_config(server_name)
-        base_url = config["url"]
-        auth_config = config.get("auth")
-        auth_token = self._get_auth_token(auth_config)
-
-        # Build full URL
-        url = f"{base_url.rstrip('/')}{endpoint}"
-
-        # Build headers
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
-        if auth_token:
-            headers["Authorization"] = f"Bearer {auth_token}"
-
-        # Make request
-        if method.upper() == "GET":
-            response = await self.http_client.get(url, headers=headers)
-        elif method.upper() == "POST":
-            response = await self.http_client.post(url, headers=headers, json=data)
-        else:
+        method = method.upper()
+        if method not in PROXY_METHODS:
             raise ValueError(f"Unsupported HTTP method: {method}")
 
+        # Validates the server is allowed on first use
+        base_url, headers = await self._resolve_endpoint(server_name)
+
+        response = await self.http_client.request(
+            method,
+            base_url + endpoint,
+            headers=headers,
+            json=data if method == "POST" else None,
+        )
         response.raise_for_status()
+        if orjson is not None:
+            # Parse the raw body directly; response.json() decodes it to str first
+            return orjson.loads(await response.aread())
         return response.json()
 
     async def list_tools(self, server_name: str) -> list[dict[str, Any]]:
@@ -191,6 +261,41 @@ class MCPHttpBridge:
         client = await self.connect_server(server_name)
         return await client.list_prompts()
 
+    async def list_all_tools(self) -> dict[str, list[dict[str, Any]] | BaseException]:
+        """List tools from every allowed server concurrently.
+
+        Returns:
+            Mapping of server_name → tool definitions, or the exception raised
+            while listing that server
+        """
+        return await self._gather_servers(self.list_tools)
+
+    async def list_all_resources(self) -> dict[str, list[dict[str, Any]] | BaseException]:
+        """List resources from every allowed server concurrently.
+
+        Returns:
+            Mapping of server_name → resource definitions, or the exception
+            raised while listing that server
+        """
+        return await self._gather_servers(self.list_resources)
+
+    async def list_all_prompts(self) -> dict[str, list[dict[str, Any]] | BaseException]:
+        """List prompts from every allowed server concurrently.
+
+        Returns:
+            Mapping of server_name → prompt definitions, or the exception raised
+            while listing that server
+        """
+        return await self._gather_servers(self.list_prompts)
+
+    async def _gather_servers(
+        self, fetch: Callable[[str], Awaitable[list[dict[str, Any]]]]
+    ) -> dict[str, list[dict[str, Any]] | BaseException]:
+        """Run ``fetch`` for every allowed server at once, keeping per-server failures."""
+        names = list(self.allowed_servers)
+        results = await asyncio.gather(*(fetch(name) for name in names), return_exceptions=True)
+        return dict(zip(names, results, strict=True))
+
     async def call_tool(self, server_name: str, tool_name: str, arguments: dict[str, Any]) -> Any:
         """Call a tool on remote MCP server.
 
@@ -205,6 +310,21 @@ class MCPHttpBridge:
         client = await self.connect_server(server_name)
         return await client.call_tool(tool_name, arguments)
 
+    async def call_tools_batch(
+        self, server_name: str, calls: list[tuple[str, dict[str, Any]]]
+    ) -> list[Any]:
+        """Call several tools on a remote MCP server in one round trip.
+
+        Args:
+            server_name: Name of the server
+            calls: (tool name, arguments) pairs
+
+        Returns:
+            Tool execution results in call order
+        """
+        client = await self.connect_server(server_name)
+        return await client.call_tools_batch(calls)
+
     async def read_resource(self, server_name: str, uri: str) -> dict[str, Any]:
         """Read a resource from remote MCP server.
 
@@ -236,8 +356,11 @@ class MCPHttpBridge:
 
     async def close(self) -> None:
         """Close HTTP client and clean up resources."""
-        await self.http_client.aclose()
+        if self._owns_http_client:
+            await self.http_client.aclose()
         self.server_clients.clear()
+        self._auth_tokens.clear()
+        self._endpoints.clear()
 
     async def __aenter__(self) -> MCPHttpBridge:
         """Async context manager entry."""
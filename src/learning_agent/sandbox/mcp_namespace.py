@@ -22,10 +22,24 @@ class MCPNamespace:
         """
         self._apis = apis
 
-        # Expose APIs as attributes (convert hyphens to underscores)
-        for name, api in apis.items():
-            attr_name = name.replace("-", "_")
-            setattr(self, attr_name, api)
+        # Expose APIs as attributes (convert hyphens to underscores); they are
+        # resolved in __getattr__ rather than copied onto the instance
+        self._attrs = {name.replace("-", "_"): api for name, api in apis.items()}
+
+    def __getattr__(self, name: str) -> Any:
+        """Resolve ``mcp.server_name`` to the server's API instance."""
+        # Read through __dict__ so lookups before __init__ finishes (e.g. during
+        # copying) raise AttributeError instead of recursing
+        try:
+            return self.__dict__["_attrs"][name]
+        except KeyError:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            ) from None
+
+    def __dir__(self) -> list[str]:
+        """Include server APIs so autocompletion lists them."""
+        return [*super().__dir__(), *self._attrs]
 
     def list_servers(self) -> list[str]:
         """List available MCP servers.
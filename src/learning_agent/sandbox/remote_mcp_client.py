@@ -2,8 +2,56 @@
 
 from __future__ import annotations
 
+import asyncio
+import copy
 import json
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    import httpx
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency (speedups extra)
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency (speedups extra)
+    ijson = None
+
+# Resolved once: inside the Pyodide sandbox requests go through the browser's
+# fetch, elsewhere (host side and tests) through httpx
+try:
+    from pyodide.http import pyfetch  # type: ignore[import-not-found]
+except ImportError:
+    pyfetch = None
+
+# Statuses meaning the server has no batch endpoint
+BATCH_UNSUPPORTED_STATUSES = frozenset({404, 405, 501})
+
+# Seconds a tools/resources/prompts listing is reused before refetching
+LISTING_CACHE_TTL = 30.0
+
+
+def _encode_json(payload: Any) -> bytes:
+    """Encode a request body as UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        # Allow non-str keys like json.dumps
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _parse_json(response: httpx.Response) -> Any:
+    """Decode an httpx response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
 
 
 class RemoteMCPClient:
@@ -13,50 +61,141 @@ class RemoteMCPClient:
     remote MCP servers via HTTP/SSE transport.
     """
 
-    def __init__(self, base_url: str, auth_token: str | None = None):
+    def __init__(
+        self,
+        base_url: str,
+        auth_token: str | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ):
         """Initialize remote MCP client.
 
         Args:
             base_url: Base URL of remote MCP server (e.g., https://mcp.example.com)
             auth_token: Optional Bearer token for authentication
+            http_client: Optional shared client for the httpx transport, owned
+                by the caller; without one the client creates and reuses its own
         """
         self.base_url = base_url.rstrip("/")
+        # Also builds the request headers, see the auth_token setter
         self.auth_token = auth_token
+        self.http_client = http_client
+        self._owns_http_client = False
         self.session_id: str | None = None
-
-    def _headers(self) -> dict[str, str]:
-        """Build HTTP headers with authentication."""
+        # None until the first batch request shows whether /tools/batch exists
+        self.supports_batch: bool | None = None
+        # (fetched_at, listing) per capability kind; listings rarely change
+        self.listing_ttl = LISTING_CACHE_TTL
+        self._listings: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+
+    @property
+    def auth_token(self) -> str | None:
+        """Bearer token sent with every request."""
+        return self._auth_token
+
+    @auth_token.setter
+    def auth_token(self, auth_token: str | None) -> None:
+        # Headers only depend on the token, so build them here, not per request
         headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
-        if self.auth_token:
-            headers["Authorization"] = f"Bearer {self.auth_token}"
-        return headers
+        if auth_token:
+            headers["Authorization"] = f"Bearer {auth_token}"
+        self._auth_token = auth_token
+        self._request_headers = headers
 
-    async def list_tools(self) -> list[dict[str, Any]]:
-        """Fetch available tools from remote MCP server.
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the httpx client, creating a pooled one on first use.
 
-        Returns:
-            List of tool definitions with name, description, and inputSchema
+        The client keeps connections alive between calls; create the
+        RemoteMCPClient on the event loop that uses it and ``aclose`` it when done.
         """
-        # In Pyodide, use pyodide.http.pyfetch
-        try:
-            from pyodide.http import pyfetch  # type: ignore[import-not-found]
-        except ImportError:
-            # Fallback for non-Pyodide environments (testing)
-            import httpx
+        if self.http_client is None:
+            # Same tuning as the bridge: HTTP/2 when h2 is installed, so
+            # concurrent calls to this server multiplex over one connection
+            from learning_agent.sandbox.mcp_http_bridge import create_http_client
+
+            self.http_client = create_http_client()
+            self._owns_http_client = True
+        return self.http_client
+
+    async def aclose(self) -> None:
+        """Close the HTTP client if this instance created it."""
+        if self._owns_http_client and self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+            self._owns_http_client = False
+
+    async def __aenter__(self) -> RemoteMCPClient:
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        """Async context manager exit."""
+        await self.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        payload: Any = None,
+        skip_body_for: frozenset[int] = frozenset(),
+        check_status: bool = False,
+    ) -> tuple[int, Any]:
+        """Send a request to the server and decode its JSON body.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (e.g., '/tools/list')
+            payload: Optional JSON request body
+            skip_body_for: Statuses whose body is not decoded (returned as None)
+            check_status: Raise for error statuses not listed in ``skip_body_for``
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(f"{self.base_url}/tools/list", headers=self._headers())
-                return response.json()
+        Returns:
+            Tuple of (HTTP status, decoded body)
 
-        response = await pyfetch(
-            f"{self.base_url}/tools/list", method="GET", headers=self._headers()
+        Raises:
+            httpx.HTTPStatusError: With ``check_status``, for an error status
+                (OSError inside Pyodide)
+        """
+        url = f"{self.base_url}{endpoint}"
+        body = None if payload is None else _encode_json(payload)
+
+        if pyfetch is not None:
+            kwargs: dict[str, Any] = {"method": method, "headers": self._headers()}
+            if body is not None:
+                kwargs["body"] = body.decode("utf-8")
+            response = await pyfetch(url, **kwargs)
+            if response.status in skip_body_for:
+                return response.status, None
+            if check_status:
+                response.raise_for_status()
+            return response.status, await response.json()
+
+        # Headers already declare application/json for the raw body
+        response = await self._get_client().request(
+            method, url, headers=self._headers(), content=body
         )
+        if response.status_code in skip_body_for:
+            return response.status_code, None
+        if check_status:
+            response.raise_for_status()
+        return response.status_code, _parse_json(response)
+
+    def _headers(self) -> dict[str, str]:
+        """Return HTTP headers with authentication.
+
+        The dict is shared between requests, so callers must not mutate it.
+        """
+        return self._request_headers
+
+    async def list_tools(self) -> list[dict[str, Any]]:
+        """Fetch available tools from remote MCP server.
 
-        data = await response.json()
-        return data.get("tools", [])
+        Returns:
+            List of tool definitions with name, description, and inputSchema
+        """
+        return await self._list("tools")
 
     async def list_resources(self) -> list[dict[str, Any]]:
         """Fetch available resources from remote MCP server.
@@ -64,23 +203,7 @@ class RemoteMCPClient:
         Returns:
             List of resource definitions with uri, name, description, mimeType
         """
-        try:
-            from pyodide.http import pyfetch  # type: ignore[import-not-found]
-        except ImportError:
-            import httpx
-
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/resources/list", headers=self._headers()
-                )
-                return response.json()
-
-        response = await pyfetch(
-            f"{self.base_url}/resources/list", method="GET", headers=self._headers()
-        )
-
-        data = await response.json()
-        return data.get("resources", [])
+        return await self._list("resources")
 
     async def list_prompts(self) -> list[dict[str, Any]]:
         """Fetch available prompts from remote MCP server.
@@ -88,23 +211,46 @@ class RemoteMCPClient:
         Returns:
             List of prompt definitions with name, description, arguments
         """
-        try:
-            from pyodide.http import pyfetch  # type: ignore[import-not-found]
-        except ImportError:
-            import httpx
+        return await self._list("prompts")
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/prompts/list", headers=self._headers()
-                )
-                return response.json()
+    async def _list(self, kind: str) -> list[dict[str, Any]]:
+        """Fetch ``/{kind}/list``, reusing a successful result for ``listing_ttl`` seconds.
 
-        response = await pyfetch(
-            f"{self.base_url}/prompts/list", method="GET", headers=self._headers()
-        )
+        Callers get a shallow copy, so mutating it leaves the cached listing intact.
+        """
+        now = time.monotonic()
+        cached = self._listings.get(kind)
+        if cached is not None and now - cached[0] < self.listing_ttl:
+            return copy.copy(cached[1])
+
+        status, data = await self._request("GET", f"/{kind}/list")
+        # pyfetch callers get the unwrapped list; httpx callers the raw body
+        listing = data.get(kind, []) if pyfetch is not None else data
 
-        data = await response.json()
-        return data.get("prompts", [])
+        # Only cache successful listings so a failing server is retried
+        if 200 <= status < 300:
+            self._listings[kind] = (now, listing)
+            return copy.copy(listing)
+        self._listings.pop(kind, None)
+        return listing
+
+    def clear_cache(self) -> None:
+        """Forget cached tool, resource and prompt listings."""
+        self._listings.clear()
+
+    async def list_all(self) -> dict[str, list[dict[str, Any]]]:
+        """Fetch tools, resources and prompts from the server concurrently.
+
+        Prefer this over three sequential ``list_*`` awaits when a full
+        capability listing is needed; it costs one round trip instead of three.
+
+        Returns:
+            Mapping with "tools", "resources" and "prompts" lists
+        """
+        tools, resources, prompts = await asyncio.gather(
+            self.list_tools(), self.list_resources(), self.list_prompts()
+        )
+        return {"tools": tools, "resources": resources, "prompts": prompts}
 
     async def call_tool(self, name: str, arguments: dict[str, Any]) -> Any:
         """Invoke a tool on the remote MCP server.
@@ -116,57 +262,135 @@ class RemoteMCPClient:
         Returns:
             Tool execution result
         """
-        try:
-            from pyodide.http import pyfetch  # type: ignore[import-not-found]
-        except ImportError:
-            import httpx
-
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/tools/call",
-                    headers=self._headers(),
-                    json={"name": name, "arguments": arguments},
-                )
-                return response.json()
-
-        response = await pyfetch(
-            f"{self.base_url}/tools/call",
-            method="POST",
-            headers=self._headers(),
-            body=json.dumps({"name": name, "arguments": arguments}),
-        )
+        _, data = await self._request("POST", "/tools/call", {"name": name, "arguments": arguments})
+        return data.get("content", []) if pyfetch is not None else data
 
-        data = await response.json()
-        return data.get("content", [])
+    async def stream_tool_call(self, name: str, arguments: dict[str, Any]) -> AsyncIterator[Any]:
+        """Invoke a tool and yield its result content items as they arrive.
 
-    async def read_resource(self, uri: str) -> dict[str, Any]:
-        """Read a resource from the remote MCP server.
+        Use this instead of ``call_tool`` for tools that return large payloads
+        (file contents, search results): with ijson installed the body is
+        decoded while it downloads, so items are available early and the
+        whole response is never held in memory at once.
+
+        Args:
+            name: Tool name to invoke
+            arguments: Tool arguments as dictionary
+
+        Yields:
+            Items of the result's ``content`` list, in order
+        """
+        async for item in self._stream_items(
+            "/tools/call", {"name": name, "arguments": arguments}, "content"
+        ):
+            yield item
+
+    async def stream_resource(self, uri: str) -> AsyncIterator[Any]:
+        """Read a resource and yield its ``contents`` items as they arrive.
 
         Args:
             uri: Resource URI to read
 
-        Returns:
-            Resource content
+        Yields:
+            Items of the resource's ``contents`` list, in order
         """
-        try:
-            from pyodide.http import pyfetch  # type: ignore[import-not-found]
-        except ImportError:
-            import httpx
+        async for item in self._stream_items("/resources/read", {"uri": uri}, "contents"):
+            yield item
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/resources/read", headers=self._headers(), json={"uri": uri}
-                )
-                return response.json()
+    async def _stream_items(self, endpoint: str, payload: Any, key: str) -> AsyncIterator[Any]:
+        """POST ``payload`` and yield the items of the ``key`` list in the response.
 
-        response = await pyfetch(
-            f"{self.base_url}/resources/read",
-            method="POST",
+        Raises:
+            httpx.HTTPStatusError: If the server answers with an error status
+        """
+        if pyfetch is not None:
+            # The browser's fetch hands over the complete body anyway
+            _, data = await self._request("POST", endpoint, payload)
+            for item in data.get(key, []):
+                yield item
+            return
+
+        async with self._get_client().stream(
+            "POST",
+            f"{self.base_url}{endpoint}",
             headers=self._headers(),
-            body=json.dumps({"uri": uri}),
+            content=_encode_json(payload),
+        ) as response:
+            response.raise_for_status()
+
+            if ijson is None:
+                await response.aread()
+                for item in _parse_json(response).get(key, []):
+                    yield item
+                return
+
+            # Push parser: feed chunks as they arrive, hand out completed items
+            items = ijson.sendable_list()
+            parser = ijson.items_coro(items, f"{key}.item", use_float=True)
+            async for chunk in response.aiter_bytes():
+                parser.send(chunk)
+                for item in items:
+                    yield item
+                del items[:]
+            parser.close()
+            for item in items:
+                yield item
+
+    async def call_tools_batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """Invoke several tools with one request to the remote MCP server.
+
+        Servers without a ``/tools/batch`` endpoint get the calls concurrently
+        through ``call_tool`` instead; that is remembered for later batches.
+        Error responses from the batch endpoint raise and are not remembered.
+
+        Args:
+            calls: (tool name, arguments) pairs, executed in order by the server
+
+        Returns:
+            Tool execution results, one per call in the same order
+        """
+        if not calls:
+            return []
+        if self.supports_batch is not False:
+            results = await self._post_tools_batch(calls)
+            if results is not None:
+                self.supports_batch = True
+                return results
+            self.supports_batch = False
+        return list(await asyncio.gather(*(self.call_tool(name, args) for name, args in calls)))
+
+    async def _post_tools_batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[Any] | None:
+        """POST ``calls`` to ``/tools/batch``; return None if the server lacks it.
+
+        Raises:
+            httpx.HTTPStatusError: If the server answers with another error
+                status, e.g. 401 or 500 (OSError inside Pyodide)
+        """
+        payload = [{"name": name, "arguments": arguments} for name, arguments in calls]
+        status, data = await self._request(
+            "POST",
+            "/tools/batch",
+            payload,
+            skip_body_for=BATCH_UNSUPPORTED_STATUSES,
+            check_status=True,
         )
+        # Anything but a list of results means this is no batch endpoint
+        if status in BATCH_UNSUPPORTED_STATUSES or not isinstance(data, list):
+            return None
+        if pyfetch is not None:
+            return [result.get("content", []) for result in data]
+        return data
 
-        data = await response.json()
+    async def read_resource(self, uri: str) -> dict[str, Any]:
+        """Read a resource from the remote MCP server.
+
+        Args:
+            uri: Resource URI to read
+
+        Returns:
+            Resource content
+        """
+        _, data = await self._request("POST", "/resources/read", {"uri": uri})
         return data
 
     async def get_prompt(
@@ -181,25 +405,7 @@ class RemoteMCPClient:
         Returns:
             Prompt content with messages
         """
-        try:
-            from pyodide.http import pyfetch  # type: ignore[import-not-found]
-        except ImportError:
-            import httpx
-
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/prompts/get",
-                    headers=self._headers(),
-                    json={"name": name, "arguments": arguments or {}},
-                )
-                return response.json()
-
-        response = await pyfetch(
-            f"{self.base_url}/prompts/get",
-            method="POST",
-            headers=self._headers(),
-            body=json.dumps({"name": name, "arguments": arguments or {}}),
+        _, data = await self._request(
+            "POST", "/prompts/get", {"name": name, "arguments": arguments or {}}
         )
-
-        data = await response.json()
         return data
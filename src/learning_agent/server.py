@@ -5,32 +5,25 @@ survive restarts across container rebuilds. Exposes an ASGI app that serves
 the LangGraph API in-process (no external platform/Redis required).
 """
 
+import functools
 import importlib
-import importlib.util
+import logging
 import os
-from typing import Any
+import uuid
+from typing import Any, cast
 
-from langchain_core.messages import SystemMessage
+from langchain_core.messages import HumanMessage, RemoveMessage, SystemMessage
 from langgraph.graph import END, StateGraph
 
 from learning_agent.agent import create_learning_agent
 from learning_agent.config import settings
+from learning_agent.learning.langmem_integration import get_learning_system
 from learning_agent.providers import get_chat_model
 from learning_agent.state import LearningAgentState
 
 
-print(
-    "[persistence] find_spec(langgraph.checkpoint.postgres)=",
-    importlib.util.find_spec("langgraph.checkpoint.postgres"),
-    flush=True,
-)
-print(
-    "[persistence] find_spec(langgraph.checkpoint.postgres.aio)=",
-    importlib.util.find_spec("langgraph.checkpoint.postgres.aio"),
-    flush=True,
-)
-PostgresSaver = None  # type: ignore[assignment]
-SQLAlchemySaver = None  # type: ignore[assignment]
+logger = logging.getLogger(__name__)
+
 
 # Print deepagents module info for sanity at startup
 try:  # pragma: no cover - startup diagnostics
@@ -47,14 +40,15 @@ except Exception as _e:  # pragma: no cover - best effort
 
 
 def _try_import(name: str):  # pragma: no cover - helper
+    # import_module finds and loads in one pass; a find_spec probe first would
+    # walk sys.path twice for every module that is present
     try:
-        if importlib.util.find_spec(name) is not None:
-            return importlib.import_module(name)
+        return importlib.import_module(name)
     except Exception:
         return None
-    return None
 
 
+# Checkpointer modules and class names across langgraph-checkpoint-postgres versions
 _pg_modules = [
     "langgraph.checkpoint.postgres",
     "langgraph.checkpoint.postgres.aio",
@@ -62,43 +56,74 @@ _pg_modules = [
     "langgraph_checkpoint_postgres.saver",
 ]
 _pg_classes = ["PostgresSaver", "AsyncPostgresSaver", "Saver"]
-for _name in _pg_modules:
-    _mod = _try_import(_name)
-    if _mod is not None:
-        print(f"[persistence] Found Postgres module: {_name}", flush=True)
-        for _cls in _pg_classes:
-            PostgresSaver = getattr(_mod, _cls, None)
-            if PostgresSaver is not None:
-                print(f"[persistence] Using Postgres saver class: {_cls}", flush=True)
-                break
-    if PostgresSaver is not None:
-        break
-
-_sql_modules = [
-    "langgraph.checkpoint.sql",
-    "langgraph.checkpoint.sqlalchemy",
-    "langgraph_checkpoint.sql",
-    "langgraph_checkpoint.sqlalchemy",
-]
-_sql_classes = ["SQLAlchemySaver", "Saver"]
-for _name in _sql_modules:
-    _mod = _try_import(_name)
-    if _mod is not None:
-        print(f"[persistence] Found SQL module: {_name}", flush=True)
-        for _cls in _sql_classes:
-            SQLAlchemySaver = getattr(_mod, _cls, None)
-            if SQLAlchemySaver is not None:
-                print(f"[persistence] Using SQLAlchemy saver class: {_cls}", flush=True)
-                break
-    if SQLAlchemySaver is not None:
-        break
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_postgres_saver() -> Any:
+    """Find the installed Postgres checkpointer class, or None.
+
+    Resolved on first use rather than at import, and only once per process.
+    """
+    for name in _pg_modules:
+        mod = _try_import(name)
+        if mod is None:
+            continue
+        logger.info(f"[persistence] Found Postgres module: {name}")
+        for cls_name in _pg_classes:
+            saver = getattr(mod, cls_name, None)
+            if saver is not None:
+                logger.info(f"[persistence] Using Postgres saver class: {cls_name}")
+                return saver
+    return None
+
+
+# Checkpointers by database URL, reused by every create_graph() call so the
+# connection and the setup() schema check happen once per process
+_CHECKPOINTERS: dict[str, Any] = {}
+_CHECKPOINTERS_SET_UP: set[str] = set()
+
+
+def _get_checkpointer(db_url: str) -> Any:
+    """Return the Postgres checkpointer for ``db_url``, creating and setting it up once."""
+    checkpointer = _CHECKPOINTERS.get(db_url)
+    if checkpointer is None:
+        postgres_saver = _resolve_postgres_saver()
+        if postgres_saver is None:
+            raise RuntimeError(
+                "Postgres checkpointer not available. Ensure 'langgraph-checkpoint-postgres' is "
+                "installed in the server image and rebuild."
+            )
+
+        # PostgresSaver API shim: support minor naming differences
+        if hasattr(postgres_saver, "from_conn_string"):
+            checkpointer = postgres_saver.from_conn_string(db_url)
+        elif hasattr(postgres_saver, "from_url"):
+            checkpointer = postgres_saver.from_url(db_url)
+        else:
+            checkpointer = postgres_saver(db_url)
+        _CHECKPOINTERS[db_url] = checkpointer
+
+    # IMPORTANT: Run setup once to ensure tables/migrations exist; a failed
+    # setup is retried by the next caller
+    if db_url not in _CHECKPOINTERS_SET_UP:
+        try:
+            if hasattr(checkpointer, "setup"):
+                checkpointer.setup()
+            _CHECKPOINTERS_SET_UP.add(db_url)
+        except Exception:
+            # If setup fails at runtime, graph will likely error later; surface clearly
+            logger.exception("Postgres checkpointer setup() failed")
+
+    return checkpointer
+
+
+# Id prefix of the per-turn "relevant prior learnings" system message
+LEARNINGS_MESSAGE_ID_PREFIX = "relevant-learnings-"
 
 
 def create_graph() -> Any:
     """Create the LangGraph graph for the learning agent with automatic learning."""
     # Get the base deepagents agent
-    from typing import cast
-
     agent = create_learning_agent()
 
     # Create a wrapper graph that adds automatic learning submission
@@ -109,54 +134,53 @@ def create_graph() -> Any:
     # intermediate events into a single step and prevents incremental updates.
 
     # Learning submission node - automatically submits conversations for learning
-    async def submit_learning_node(state: LearningAgentState) -> LearningAgentState:
+    async def submit_learning_node(state: LearningAgentState) -> dict[str, Any]:
         """Submit the conversation for background learning via LangMem."""
-        from learning_agent.learning.langmem_integration import get_learning_system
-
         messages = state.get("messages", [])
 
         # Only submit if there's meaningful conversation (more than just the initial human message)
-        if messages and len(messages) > 1:
-            learning_system = get_learning_system()
-
-            # Check if any tasks were completed
-            todos = state.get("todos", [])
-            completed_tasks = [t for t in todos if t.get("status") == "completed"]
-
-            # Use immediate processing (0 delay) since we learn at the end of conversations
-            delay_seconds = 0
-
-            # Submit to learning system and await completion
-            await learning_system.submit_conversation_for_learning(
-                messages=messages,
-                delay_seconds=delay_seconds,
-                metadata={
-                    "thread_id": state.get("thread_id"),
-                    "todos": todos,
-                    "completed_count": len(completed_tasks),
-                    "total_todos": len(todos) if todos else 0,
-                },
-            )
+        if not messages or len(messages) <= 1:
+            return {}
 
-            # Log submission for debugging
-            import logging
+        learning_system = get_learning_system()
+
+        # Check if any tasks were completed
+        todos = state.get("todos", [])
+        completed_count = sum(1 for t in todos if t.get("status") == "completed")
+        total_todos = len(todos) if todos else 0
+
+        # Use immediate processing (0 delay) since we learn at the end of conversations
+        delay_seconds = 0
+
+        # Submit to learning system and await completion
+        await learning_system.submit_conversation_for_learning(
+            messages=messages,
+            delay_seconds=delay_seconds,
+            metadata={
+                "thread_id": state.get("thread_id"),
+                "todos": todos,
+                "completed_count": completed_count,
+                "total_todos": total_todos,
+            },
+        )
 
-            logger = logging.getLogger(__name__)
+        # Log submission for debugging
+        if logger.isEnabledFor(logging.INFO):
             logger.info(
                 f"Submitted conversation for learning: "
                 f"{len(messages)} messages, "
-                f"{len(completed_tasks)}/{len(todos) if todos else 0} tasks completed, "
+                f"{completed_count}/{total_todos} tasks completed, "
                 f"delay={delay_seconds}s"
             )
 
-        # Return state unchanged - this is a side-effect only node
-        return state
+        # Side-effect only node: an empty update leaves every channel untouched.
+        # Returning the full state would re-merge all messages and re-append
+        # operator.add channels such as sandbox_error_history.
+        return {}
 
-    async def fetch_relevant_learnings_node(state: LearningAgentState) -> LearningAgentState:
+    async def fetch_relevant_learnings_node(state: LearningAgentState) -> dict[str, Any]:
         """Enrich the conversation with relevant prior learnings before execution."""
 
-        from learning_agent.learning.langmem_integration import get_learning_system
-
         messages = list(state.get("messages", []) or [])
 
         # Find latest human utterance to use as the similarity query
@@ -174,7 +198,7 @@ def create_graph() -> Any:
                     human_message_count += 1
 
         if not last_human_content:
-            return state
+            return {}
 
         # Hybrid approach: First message uses raw content, follow-ups synthesize context
         if human_message_count == 1:
@@ -183,8 +207,6 @@ def create_graph() -> Any:
         else:
             # Follow-up message: synthesize task context from conversation history
             try:
-                from langchain_core.messages import HumanMessage
-
                 llm = get_chat_model(settings)
 
                 # Build conversation context for synthesis
@@ -208,27 +230,27 @@ Task description:"""
 
                 if synthesized:
                     query = synthesized
-                    logging.getLogger(__name__).info(f"Synthesized task query: {query[:100]}")
+                    logger.info(f"Synthesized task query: {query[:100]}")
                 else:
                     # Fallback to raw message
                     query = last_human_content
             except Exception:
                 # Fallback to raw message if synthesis fails
-                logging.getLogger(__name__).exception("Failed to synthesize task context")
+                logger.exception("Failed to synthesize task context")
                 query = last_human_content
 
         if not query:
-            return state
+            return {}
 
         learning_system = get_learning_system()
         try:
             prior = await learning_system.search_similar_tasks(query, limit=3)
         except Exception as exc:  # pragma: no cover - defensive logging only
-            logging.getLogger(__name__).exception("Failed to fetch similar learnings", exc_info=exc)
-            return state
+            logger.exception("Failed to fetch similar learnings", exc_info=exc)
+            return {}
 
         if not prior:
-            return state
+            return {}
 
         lines: list[str] = ["Relevant prior learnings from similar tasks:"]
         summaries: list[str] = []
@@ -267,13 +289,19 @@ Task description:"""
             summaries.append(summary)
             lines.append(summary)
 
-        system_message = SystemMessage(content="\n\n".join(lines))
-        updated_messages = [*messages, system_message]
-
-        new_state = dict(state)
-        new_state["messages"] = updated_messages
-        new_state["relevant_learnings"] = summaries
-        return new_state  # type: ignore[return-value]
+        # Return only the update. The add_messages reducer drops the previous
+        # turn's learnings (so a long thread keeps one copy, not one per turn)
+        # and appends the new message.
+        stale = [
+            RemoveMessage(id=message.id)
+            for message in messages
+            if isinstance(message, SystemMessage)
+            and (message.id or "").startswith(LEARNINGS_MESSAGE_ID_PREFIX)
+        ]
+        system_message = SystemMessage(
+            content="\n\n".join(lines), id=f"{LEARNINGS_MESSAGE_ID_PREFIX}{uuid.uuid4()}"
+        )
+        return {"messages": [*stale, system_message], "relevant_learnings": summaries}
 
     # Add nodes to the graph
     workflow.add_node("fetch_relevant_learnings", fetch_relevant_learnings_node)
@@ -295,29 +323,7 @@ Task description:"""
     if db_url.startswith("postgresql://"):
         db_url = db_url.replace("postgresql://", "postgresql+psycopg://", 1)
 
-    if PostgresSaver is None:
-        raise RuntimeError(
-            "Postgres checkpointer not available. Ensure 'langgraph-checkpoint-postgres' is installed "
-            "in the server image and rebuild."
-        )
-
-    # PostgresSaver API shim: support minor naming differences
-    if hasattr(PostgresSaver, "from_conn_string"):
-        checkpointer = PostgresSaver.from_conn_string(db_url)  # type: ignore[attr-defined]
-    elif hasattr(PostgresSaver, "from_url"):
-        checkpointer = PostgresSaver.from_url(db_url)  # type: ignore[attr-defined]
-    else:
-        checkpointer = PostgresSaver(db_url)  # type: ignore[call-arg]
-
-    # IMPORTANT: Run setup once to ensure tables/migrations exist
-    try:
-        if hasattr(checkpointer, "setup"):
-            checkpointer.setup()  # type: ignore[attr-defined]
-    except Exception:
-        # If setup fails at runtime, graph will likely error later; surface clearly
-        import logging
-
-        logging.getLogger(__name__).exception("Postgres checkpointer setup() failed")
+    checkpointer = _get_checkpointer(db_url)
 
     # Compile and return the graph with persistence
     return workflow.compile(checkpointer=checkpointer)
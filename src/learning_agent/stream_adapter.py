@@ -151,10 +151,15 @@ class StreamAdapter:
             lambda: itertools.count(1)
         )
         self._child_calls: dict[str, str] = {}
+        self._child_seq = itertools.count(1)
         self._run_id: str | None = None
         self._event_log: list[str] = []
         self._structured_content: list[str] = []
 
+    def _new_call_id(self) -> str:
+        """Mint a child call id, unique through the root id without reading entropy."""
+        return f"{self._root_call_id}.{next(self._child_seq)}"
+
     @property
     def trace_id(self) -> str:
         return self._trace_id
@@ -271,8 +276,10 @@ class StreamAdapter:
             return
 
         if kind == "on_tool_start":
-            key = data.get("id") or event.get("run_id") or f"{name}:{uuid.uuid4()}"
-            call_id = self._child_calls.setdefault(key, str(uuid.uuid4()))
+            key = data.get("id") or event.get("run_id") or f"{name}:{self._new_call_id()}"
+            call_id = self._child_calls.get(key)
+            if call_id is None:
+                call_id = self._child_calls[key] = self._new_call_id()
             payload = {
                 "tool_name": name or data.get("name"),
                 "args": data.get("input") or data.get("tool_input") or {},
@@ -288,8 +295,8 @@ class StreamAdapter:
             return
 
         if kind == "on_tool_end":
-            key = data.get("id") or event.get("run_id") or f"{name}:{uuid.uuid4()}"
-            call_id = self._child_calls.pop(key, str(uuid.uuid4()))
+            key = data.get("id") or event.get("run_id") or f"{name}:{self._new_call_id()}"
+            call_id = self._child_calls.pop(key, None) or self._new_call_id()
             tool_name = name or data.get("name")
             result = coerce_to_dict(data.get("output"))
             payload = {
@@ -380,7 +387,7 @@ class StreamAdapter:
     ) -> None:
         """Emit a synthetic start/end pair for tools that never surfaced."""
 
-        call_id = str(uuid.uuid4())
+        call_id = self._new_call_id()
         start = self._envelope(
             type_="tool_start",
             call_id=call_id,
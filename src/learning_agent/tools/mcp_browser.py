@@ -67,6 +67,9 @@ _MCP_SESSION: Any | None = None
 _MCP_SESSION_LOCK: asyncio.Lock | None = None
 _MCP_SESSION_LOOP: asyncio.AbstractEventLoop | None = None
 _SERVER_CFG: dict[str, Any] | None = None
+# Whether the current server session has navigated to a real page. Once set,
+# page-bound tools skip the preflight ``url`` round-trip.
+_PAGE_LOADED = False
 
 
 async def _create_session_locked() -> None:
@@ -82,7 +85,9 @@ async def _create_session_locked() -> None:
 
 
 async def _close_session_locked() -> None:
-    global _MCP_SESSION_CTX, _MCP_SESSION, _MCP_SESSION_LOOP
+    global _MCP_SESSION_CTX, _MCP_SESSION, _MCP_SESSION_LOOP, _PAGE_LOADED
+    # A new server process starts on about:blank
+    _PAGE_LOADED = False
     session_cm = _MCP_SESSION_CTX
     if session_cm is None:
         return
@@ -302,8 +307,10 @@ def create_mcp_browser_tools() -> list[Any]:  # returns LangChain tools when ava
             __requires_page: bool = base_name in tools_requiring_page,
             **kwargs: Any,
         ) -> tuple[str | list[str], list[Any] | None]:
-            # Check if page is loaded for tools that require it
-            if __requires_page:
+            global _PAGE_LOADED
+            # Check if page is loaded for tools that require it, unless this
+            # session has already navigated somewhere
+            if __requires_page and not _PAGE_LOADED:
                 try:
                     url_result = await _call_tool_with_session("url", {})
                     current_url_raw = url_result[0] if isinstance(url_result, tuple) else url_result
@@ -322,8 +329,16 @@ def create_mcp_browser_tools() -> list[Any]:  # returns LangChain tools when ava
                 except Exception:
                     # If we can't even get the URL, assume no page is loaded
                     return ("No page loaded. Use research_goto to navigate to a URL first.", None)
-
-            return await _call_tool_with_session(__original_name, kwargs)
+                _PAGE_LOADED = True
+
+            result = await _call_tool_with_session(__original_name, kwargs)
+            if __original_name == "goto":
+                # A failed navigation raises before reaching this point
+                _PAGE_LOADED = kwargs.get("url") != "about:blank"
+            elif __original_name in ("close", "batch_execute"):
+                # A batch may have closed the page; re-check on the next call
+                _PAGE_LOADED = False
+            return result
 
         structured = StructuredTool(
             name=f"research_{base_name}",
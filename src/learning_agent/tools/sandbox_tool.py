@@ -15,6 +15,9 @@ from learning_agent.state import LearningAgentState
 
 logger = logging.getLogger(__name__)
 
+# Sandbox output files returned to the UI as images
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".bmp", ".webp")
+
 
 # Note: TypeScript source is now baked into Docker image via LANGCHAIN_SANDBOX_TS_PATH
 # No need to patch at runtime - pyodide.py handles this correctly now
@@ -66,45 +69,35 @@ class EnhancedSandbox:
             return
 
         try:
-            from learning_agent.sandbox.api_generator import generate_api_class
+            from learning_agent.sandbox.api_generator import load_api_class
             from learning_agent.sandbox.mcp_http_bridge import MCPHttpBridge
 
             # Create HTTP bridge
             self.mcp_bridge = MCPHttpBridge(self.mcp_servers)
 
+            # Fetch tools from all remote servers at once
+            server_tools = await self.mcp_bridge.list_all_tools()
+
             # Generate API for each server
             for server_name, config in self.mcp_servers.items():
                 logger.info(f"Loading MCP API for server: {server_name}")
 
+                tools = server_tools[server_name]
+                if isinstance(tools, BaseException):
+                    logger.error(
+                        f"Failed to load MCP API for {server_name}: {tools}", exc_info=tools
+                    )
+                    continue
+
                 try:
-                    # Fetch tools from remote server
-                    tools = await self.mcp_bridge.list_tools(server_name)
-
-                    # Generate Python API class code
-                    api_code = await generate_api_class(server_name, config["url"], tools)
-
-                    # Create API instance by executing generated code
-                    # and binding it to the MCP bridge client
-                    namespace: dict[str, Any] = {}
-                    exec(api_code, namespace)  # nosec B102 - Generated code is trusted
-
-                    # Find the API class (should be {ServerName}API)
-                    api_class = None
-                    for name, obj in namespace.items():
-                        if name.endswith("API") and isinstance(obj, type):
-                            api_class = obj
-                            break
-
-                    if api_class:
-                        # Get client for this server
-                        client = await self.mcp_bridge.connect_server(server_name)
-                        # Instantiate API with client
-                        self.mcp_apis[server_name] = api_class(client)
-                        logger.info(f"Loaded MCP API: {server_name}")
-                    else:
-                        logger.warning(
-                            f"Could not find API class in generated code for {server_name}"
-                        )
+                    # Generate (or load cached) API class for the server's tools
+                    api_class = await load_api_class(server_name, config["url"], tools)
+
+                    # Get client for this server
+                    client = await self.mcp_bridge.connect_server(server_name)
+                    # Instantiate API with client
+                    self.mcp_apis[server_name] = api_class(client)
+                    logger.info(f"Loaded MCP API: {server_name}")
 
                 except Exception as e:
                     logger.error(f"Failed to load MCP API for {server_name}: {e}", exc_info=True)
@@ -176,11 +169,8 @@ mcp = _MCPProxy({api_repr!r})
             import base64
 
             for filepath, content in result.files.items():
-                # Only track image files
-                if any(
-                    filepath.endswith(ext)
-                    for ext in [".png", ".jpg", ".jpeg", ".gif", ".svg", ".bmp", ".webp"]
-                ):
+                # Only track image files (str.endswith checks the whole tuple in C)
+                if filepath.endswith(IMAGE_EXTENSIONS):
                     files.append(filepath)
                     # Content is always bytes from PyodideSandbox
                     files_data[filepath] = base64.b64encode(content).decode("utf-8")
@@ -0,0 +1,164 @@
+"""Unit tests for helpers and tools of the browser MCP stdio server."""
+
+import json
+
+import pytest
+
+
+pytest.importorskip("mcp.server.fastmcp")
+
+from learning_agent.mcp.servers import browser_use_stdioserver as server
+
+
+PAGE = (
+    "<html><head><title>T</title><style>a{}</style></head><body>"
+    "<h1>Title here</h1><p>Hello <b>world</b>,   this is a test.</p><div>x</div>"
+    "<ul><li>One item</li><li>Two <a href='/t'>link text</a></li></ul>"
+    "<script>var a = 1</script></body></html>"
+)
+
+
+@pytest.mark.skipif(not server.HAVE_LEXBOR, reason="selectolax not installed")
+def test_clean_page_content_walks_text_and_skips_non_content() -> None:
+    """Block elements become lines; scripts, styles and short lines are dropped."""
+
+    text, stats, links = server._clean_page_content(PAGE)
+
+    assert text == "# Title here\nHello world, this is a test.\nOne item\nTwo link text"
+    assert stats["original_html_chars"] == len(PAGE)
+    assert stats["filtered_text_chars"] == len(text)
+    assert links == []
+
+
+@pytest.mark.skipif(not server.HAVE_LEXBOR, reason="selectolax not installed")
+def test_clean_page_content_renders_links_as_markdown() -> None:
+    """With extract_links, anchors are emitted as markdown links."""
+
+    text, _, links = server._clean_page_content(PAGE, extract_links=True)
+
+    assert text.endswith("Two [link text](/t)")
+    assert links == [{"text": "link text", "href": "/t"}]
+
+
+@pytest.mark.skipif(not server.HAVE_LEXBOR, reason="selectolax not installed")
+def test_clean_page_content_dedups_links_in_document_order() -> None:
+    """Repeated anchors are reported once, in first-seen order."""
+
+    html = "<body>" + "<a href='/a'>A</a><a href='/b'>B</a>" * 3 + "</body>"
+
+    _, _, links = server._clean_page_content(html, extract_links=True)
+
+    assert links == [{"text": "A", "href": "/a"}, {"text": "B", "href": "/b"}]
+
+
+@pytest.mark.parametrize("use_lexbor", [True, False])
+def test_clean_page_content_ignores_body_tag_text_in_head(monkeypatch, use_lexbor) -> None:
+    """A "<body" string inside a head script does not start the page text."""
+
+    if use_lexbor and not server.HAVE_LEXBOR:
+        pytest.skip("selectolax not installed")
+    if not use_lexbor:
+        pytest.importorskip("html2text")
+    monkeypatch.setattr(server, "HAVE_LEXBOR", use_lexbor)
+    html = '<html><head><script>var x="<body>";</script></head><body><p>Real text</p></body></html>'
+
+    text, _, _ = server._clean_page_content(html)
+
+    assert text.strip() == "Real text"
+
+
+def test_smart_truncate_uses_offsets_and_prefers_paragraph_breaks() -> None:
+    """Truncation lengths are relative to ``start`` and end on a nearby break."""
+
+    text = "intro " * 10 + "a" * 900 + "\n\n" + "b" * 200
+
+    assert server._smart_truncate(text, 60, 5_000) == len(text) - 60
+    assert server._smart_truncate(text, 60, 1_000) == 900
+    assert server._smart_truncate("x" * 50, 10, 20) == 20
+
+
+@pytest.mark.asyncio
+async def test_batch_execute_runs_in_order_and_stops_on_error(monkeypatch) -> None:
+    """Results are spliced in order; the first failure ends the batch."""
+
+    calls: list[str] = []
+
+    async def fake_goto(url: str) -> str:
+        calls.append(url)
+        return server._dumps({"action": "goto", "status": "ok", "url": url})
+
+    monkeypatch.setitem(server._BATCH_TOOLS, "goto", fake_goto)
+    operations = [
+        {"tool": "goto", "arguments": {"url": "https://a.test"}},
+        {"tool": "missing"},
+        {"tool": "goto", "arguments": {"url": "https://b.test"}},
+    ]
+
+    stopped = json.loads(await server.batch_execute(operations))
+    assert calls == ["https://a.test"]
+    assert stopped[0] == {
+        "index": 0,
+        "tool": "goto",
+        "ok": True,
+        "result": {"action": "goto", "status": "ok", "url": "https://a.test"},
+    }
+    assert stopped[1]["ok"] is False
+    assert "missing" in stopped[1]["error"]
+    assert len(stopped) == 2
+
+    continued = json.loads(await server.batch_execute(operations, stop_on_error=False))
+    assert [record["ok"] for record in continued] == [True, False, True]
+
+
+@pytest.mark.asyncio
+async def test_batch_execute_reports_malformed_operations() -> None:
+    """A non-object operation is an error record, not an aborted batch."""
+
+    records = json.loads(
+        await server.batch_execute(["goto", {"tool": ["goto"]}], stop_on_error=False)
+    )
+
+    assert [record["ok"] for record in records] == [False, False]
+    assert "object" in records[0]["error"]
+    assert "Unknown browser tool" in records[1]["error"]
+
+
+@pytest.mark.asyncio
+async def test_extract_reads_full_page_when_capped_html_has_no_text(monkeypatch) -> None:
+    """A capped read without the requested text falls back to the whole page."""
+
+    class FakePage:
+        url = "https://a.test"
+
+        def __init__(self) -> None:
+            self.scripts: list[str] = []
+
+        async def evaluate(self, script: str, cap: int) -> str:
+            self.scripts.append(script)
+            # Cap reached before the body's text starts
+            return "<body><div class='x'></div>" + " " * cap
+
+        async def content(self) -> str:
+            return "<html><body><p>Hello world text</p></body></html>"
+
+    class FakeLLM:
+        async def ainvoke(self, prompt: str) -> str:
+            return "extracted"
+
+    page = FakePage()
+
+    async def fake_ensure_playwright() -> FakePage:
+        return page
+
+    monkeypatch.setattr(server, "HAVE_PW", True)
+    monkeypatch.setattr(server, "EXTRACT_INNER_TEXT", False)
+    monkeypatch.setattr(server, "FULL_HTML", False)
+    monkeypatch.setattr(server, "_ensure_playwright", fake_ensure_playwright)
+    monkeypatch.setattr(server, "_get_llm", FakeLLM)
+
+    result = json.loads(await server.extract_structured_data("greeting"))
+
+    assert "document.body" in page.scripts[0]
+    assert result["status"] == "ok"
+    assert result["total_filtered_chars"] == len("Hello world text")
+    assert result["stats"]["html_truncated"] is False
@@ -1,10 +1,13 @@
 """Tests for MCP code-mode integration."""
 
+import json
+
 import pytest
 
 from learning_agent.sandbox.api_generator import (
     generate_api_class,
     generate_method,
+    generate_method_body,
     json_schema_to_python_type,
     snake_to_pascal,
 )
@@ -86,6 +89,28 @@ class TestAPIGenerator:
         # Check body calls client
         assert "await self._client.call_tool" in method_code
 
+    def test_generate_method_body_skips_filtering_required_args(self):
+        """Test only optional arguments are checked for None in generated bodies."""
+        required_only = {
+            "name": "goto",
+            "inputSchema": {"properties": {"url": {"type": "string"}}, "required": ["url"]},
+        }
+        mixed = {
+            "name": "goto",
+            "inputSchema": {
+                "properties": {"url": {"type": "string"}, "timeout": {"type": "integer"}},
+                "required": ["url"],
+            },
+        }
+
+        required_body = generate_method_body(required_only)
+        assert "is not None" not in required_body
+        assert 'call_tool("goto", {' in required_body
+
+        mixed_body = generate_method_body(mixed)
+        assert "if timeout is not None:" in mixed_body
+        assert "if url is not None:" not in mixed_body
+
     @pytest.mark.asyncio
     async def test_generate_api_class(self):
         """Test API class generation."""
@@ -122,6 +147,83 @@ class TestAPIGenerator:
         assert "async def goto" in class_code
         assert "async def screenshot" in class_code
 
+    @pytest.mark.asyncio
+    async def test_load_api_class_reuses_cached_bytecode(self, tmp_path, monkeypatch):
+        """Test API classes are compiled once and then loaded from the cache."""
+        from learning_agent.sandbox import api_generator
+
+        monkeypatch.setattr(api_generator, "API_CODE_CACHE_DIR", tmp_path)
+        tools = [
+            {
+                "name": "goto",
+                "description": "Navigate to a URL",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {"url": {"type": "string"}},
+                    "required": ["url"],
+                },
+            }
+        ]
+
+        api_class = await api_generator.load_api_class("browser", "https://b.example.com", tools)
+        assert api_class.__name__ == "BrowserAPI"
+        assert len(list(tmp_path.glob("*.pyc"))) == 1
+
+        async def fail_generate(*args):
+            raise AssertionError("cached API should not be regenerated")
+
+        monkeypatch.setattr(api_generator, "generate_api_class", fail_generate)
+        cached_class = await api_generator.load_api_class("browser", "https://b.example.com", tools)
+        assert cached_class.__name__ == "BrowserAPI"
+        assert hasattr(cached_class, "goto")
+
+    @pytest.mark.asyncio
+    async def test_load_api_class_cache_follows_generator_source(self, tmp_path, monkeypatch):
+        """Test cached classes are regenerated once the generator source changes."""
+        from learning_agent.sandbox import api_generator
+
+        monkeypatch.setattr(api_generator, "API_CODE_CACHE_DIR", tmp_path)
+        tools = [{"name": "goto", "inputSchema": {"properties": {}}}]
+        await api_generator.load_api_class("browser", "https://b.example.com", tools)
+
+        generated = []
+        real_generate = api_generator.generate_api_class
+
+        async def counting_generate(*args):
+            generated.append(args[0])
+            return await real_generate(*args)
+
+        monkeypatch.setattr(api_generator, "generate_api_class", counting_generate)
+        monkeypatch.setattr(api_generator, "_generator_digest", lambda: b"edited generator")
+        await api_generator.load_api_class("browser", "https://b.example.com", tools)
+
+        assert generated == ["browser"]
+        assert len(list(tmp_path.glob("*.pyc"))) == 2
+
+    @pytest.mark.asyncio
+    async def test_generate_apis_shares_one_http_client(self, monkeypatch):
+        """Test multi-server generation reuses one HTTP client for all servers."""
+        from learning_agent.sandbox import api_generator
+
+        seen_clients = []
+
+        async def fake_generate(server_name, server_url, auth_token=None, http_client=None):
+            seen_clients.append(http_client)
+            return f"# {server_name} at {server_url}"
+
+        monkeypatch.setattr(api_generator, "generate_api_from_remote", fake_generate)
+
+        sources = await api_generator.generate_apis(
+            [("browser", "https://b.example.com", None), ("files", "https://f.example.com", "t")]
+        )
+
+        assert sources == {
+            "browser": "# browser at https://b.example.com",
+            "files": "# files at https://f.example.com",
+        }
+        assert seen_clients[0] is not None
+        assert seen_clients[0] is seen_clients[1]
+
 
 @pytest.mark.asyncio
 class TestMCPHttpBridge:
@@ -156,6 +258,330 @@ class TestMCPHttpBridge:
         with pytest.raises(ValueError, match="not allowed"):
             await bridge.get_server_config("invalid")
 
+    async def test_proxy_request_resolves_server_once(self):
+        """Test proxied requests reuse the resolved URL and auth headers."""
+        from learning_agent.sandbox.mcp_http_bridge import MCPHttpBridge
+
+        class FakeResponse:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {"ok": True}
+
+            async def aread(self):
+                return b'{"ok": true}'
+
+        class FakeClient:
+            def __init__(self):
+                self.calls = []
+
+            async def request(self, method, url, headers=None, json=None):
+                self.calls.append((method, url, headers, json))
+                return FakeResponse()
+
+        servers = {
+            "browser": {
+                "url": "https://browser.example.com/",
+                "auth": {"type": "bearer", "token": "test-token"},
+            }
+        }
+        bridge = MCPHttpBridge(servers)
+        bridge.http_client = FakeClient()
+
+        assert await bridge.proxy_request("browser", "/tools/list") == {"ok": True}
+        await bridge.proxy_request("browser", "/tools/call", "post", {"name": "goto"})
+
+        (get_call, post_call) = bridge.http_client.calls
+        assert get_call[:2] == ("GET", "https://browser.example.com/tools/list")
+        assert get_call[3] is None
+        assert post_call[:2] == ("POST", "https://browser.example.com/tools/call")
+        assert post_call[2]["Authorization"] == "Bearer test-token"
+        assert post_call[3] == {"name": "goto"}
+
+        with pytest.raises(ValueError, match="Unsupported HTTP method"):
+            await bridge.proxy_request("browser", "/tools/list", "DELETE")
+
+    async def test_auth_token_env_read_once_until_reload(self, monkeypatch):
+        """Test env-provided tokens are cached until reload_config."""
+        from learning_agent.sandbox.mcp_http_bridge import MCPHttpBridge
+
+        servers = {
+            "browser": {
+                "url": "https://browser.example.com",
+                "auth": {"type": "bearer", "token_env": "BROWSER_MCP_TOKEN"},
+            }
+        }
+        bridge = MCPHttpBridge(servers)
+        monkeypatch.setenv("BROWSER_MCP_TOKEN", "first")
+
+        client = await bridge.connect_server("browser")
+        _, headers = await bridge._resolve_endpoint("browser")
+        assert client.auth_token == "first"
+        assert client.http_client is bridge.http_client
+        assert headers["Authorization"] == "Bearer first"
+
+        monkeypatch.setenv("BROWSER_MCP_TOKEN", "second")
+        _, headers = await bridge._resolve_endpoint("browser")
+        assert headers["Authorization"] == "Bearer first"
+
+        bridge.reload_config()
+        _, headers = await bridge._resolve_endpoint("browser")
+        assert headers["Authorization"] == "Bearer second"
+
+    async def test_list_all_tools_keeps_per_server_failures(self):
+        """Test tools are listed from every server with failures kept per server."""
+        from learning_agent.sandbox.mcp_http_bridge import MCPHttpBridge
+
+        servers = {
+            "browser": {"url": "https://browser.example.com"},
+            "files": {"url": "https://files.example.com"},
+        }
+        bridge = MCPHttpBridge(servers)
+
+        async def fake_list_tools(server_name):
+            if server_name == "files":
+                raise RuntimeError("unreachable")
+            return [{"name": "goto"}]
+
+        bridge.list_tools = fake_list_tools
+
+        results = await bridge.list_all_tools()
+        assert results["browser"] == [{"name": "goto"}]
+        assert isinstance(results["files"], RuntimeError)
+
+
+@pytest.mark.asyncio
+class TestRemoteMCPClient:
+    """Test remote MCP client batching."""
+
+    async def test_reuses_one_http_client_until_closed(self):
+        """Test calls share a pooled client that aclose releases."""
+        from learning_agent.sandbox.remote_mcp_client import RemoteMCPClient
+
+        async with RemoteMCPClient("https://browser.example.com") as client:
+            http_client = client._get_client()
+            assert client._get_client() is http_client
+        assert client.http_client is None
+
+        class SharedClient:
+            async def aclose(self):
+                raise AssertionError("injected client belongs to the caller")
+
+        shared = SharedClient()
+        injected = RemoteMCPClient("https://browser.example.com", http_client=shared)
+        assert injected._get_client() is shared
+        await injected.aclose()
+
+    async def test_headers_built_once_per_token(self):
+        """Test request headers are reused and follow token changes."""
+        from learning_agent.sandbox.remote_mcp_client import RemoteMCPClient
+
+        client = RemoteMCPClient("https://browser.example.com", "first")
+        headers = client._headers()
+        assert client._headers() is headers
+        assert headers["Authorization"] == "Bearer first"
+
+        client.auth_token = None
+        assert "Authorization" not in client._headers()
+
+    async def test_listings_are_cached_until_ttl_or_clear(self):
+        """Test successful listings are reused and failed ones are refetched."""
+        from learning_agent.sandbox.remote_mcp_client import RemoteMCPClient
+
+        class FakeResponse:
+            def __init__(self, status_code, body):
+                self.status_code = status_code
+                self.is_success = status_code < 400
+                self.content = body
+
+            def json(self):
+                return json.loads(self.content)
+
+        class FakeClient:
+            def __init__(self):
+                self.statuses = [503, 200, 200]
+                self.gets = 0
+
+            async def request(self, method, url, headers=None, content=None):
+                assert method == "GET"
+                self.gets += 1
+                return FakeResponse(self.statuses.pop(0), b'[{"name": "goto"}]')
+
+        http_client = FakeClient()
+        client = RemoteMCPClient("https://browser.example.com", http_client=http_client)
+
+        await client.list_tools()  # 503: not cached
+        assert await client.list_tools() == [{"name": "goto"}]
+        (await client.list_tools()).clear()  # callers cannot corrupt the cache
+        assert await client.list_tools() == [{"name": "goto"}]
+        assert http_client.gets == 2
+
+        client.clear_cache()
+        await client.list_tools()
+        assert http_client.gets == 3
+
+    async def test_list_all_fetches_every_listing(self):
+        """Test list_all combines tools, resources and prompts."""
+        from learning_agent.sandbox.remote_mcp_client import RemoteMCPClient
+
+        client = RemoteMCPClient("https://browser.example.com")
+
+        async def listing(kind):
+            return [{"name": kind}]
+
+        client.list_tools = lambda: listing("tool")
+        client.list_resources = lambda: listing("resource")
+        client.list_prompts = lambda: listing("prompt")
+
+        assert await client.list_all() == {
+            "tools": [{"name": "tool"}],
+            "resources": [{"name": "resource"}],
+            "prompts": [{"name": "prompt"}],
+        }
+
+    async def test_call_tools_batch_falls_back_without_batch_endpoint(self):
+        """Test batches run per call once the server lacks /tools/batch."""
+        from learning_agent.sandbox.remote_mcp_client import RemoteMCPClient
+
+        client = RemoteMCPClient("https://browser.example.com")
+        batch_posts = []
+
+        async def fake_post_tools_batch(calls):
+            batch_posts.append(calls)
+
+        async def fake_call_tool(name, arguments):
+            return {"tool": name, **arguments}
+
+        client._post_tools_batch = fake_post_tools_batch
+        client.call_tool = fake_call_tool
+        calls = [("goto", {"url": "https://example.com"}), ("screenshot", {})]
+
+        assert await client.call_tools_batch(calls) == [
+            {"tool": "goto", "url": "https://example.com"},
+            {"tool": "screenshot"},
+        ]
+        await client.call_tools_batch(calls)
+
+        assert client.supports_batch is False
+        assert len(batch_posts) == 1
+
+    async def test_call_tools_batch_uses_single_request(self):
+        """Test servers with a batch endpoint get one request per batch."""
+        from learning_agent.sandbox.remote_mcp_client import RemoteMCPClient
+
+        client = RemoteMCPClient("https://browser.example.com")
+
+        async def fake_post_tools_batch(calls):
+            return [f"{name} done" for name, _ in calls]
+
+        async def fail_call_tool(name, arguments):
+            raise AssertionError("call_tool should not be used")
+
+        client._post_tools_batch = fake_post_tools_batch
+        client.call_tool = fail_call_tool
+
+        assert await client.call_tools_batch([("goto", {}), ("click", {})]) == [
+            "goto done",
+            "click done",
+        ]
+        assert client.supports_batch is True
+
+    async def test_call_tools_batch_raises_on_error_status(self):
+        """Test error responses raise instead of passing for results."""
+        from learning_agent.sandbox.remote_mcp_client import RemoteMCPClient
+
+        class StatusError(Exception):
+            pass
+
+        class FakeResponse:
+            def __init__(self, status_code, body):
+                self.status_code = status_code
+                self.content = body
+
+            def raise_for_status(self):
+                if self.status_code >= 400:
+                    raise StatusError(self.status_code)
+
+        class FakeClient:
+            def __init__(self):
+                self.responses = [FakeResponse(500, b'{"error": "boom"}')]
+
+            async def request(self, method, url, headers=None, content=None):
+                return self.responses.pop(0)
+
+        http_client = FakeClient()
+        client = RemoteMCPClient("https://browser.example.com", http_client=http_client)
+
+        with pytest.raises(StatusError):
+            await client.call_tools_batch([("goto", {})])
+        assert client.supports_batch is None
+
+        # A success body that is not a result list is no batch endpoint
+        http_client.responses.append(FakeResponse(200, b'{"status": "ok"}'))
+
+        async def fake_call_tool(name, arguments):
+            return f"{name} done"
+
+        client.call_tool = fake_call_tool
+        assert await client.call_tools_batch([("goto", {})]) == ["goto done"]
+        assert client.supports_batch is False
+
+    async def test_stream_tool_call_yields_content_items(self):
+        """Test streamed tool results are decoded across chunk boundaries."""
+        from learning_agent.sandbox.remote_mcp_client import RemoteMCPClient
+
+        body = json.dumps({"content": [{"type": "text", "text": "a" * 50}, {"n": 1.5}]})
+
+        class FakeStreamResponse:
+            def raise_for_status(self):
+                pass
+
+            async def aread(self):
+                return self.content
+
+            @property
+            def content(self):
+                return body.encode()
+
+            def json(self):
+                return json.loads(body)
+
+            async def aiter_bytes(self):
+                for start in range(0, len(body), 7):
+                    yield body[start : start + 7].encode()
+
+        class FakeClient:
+            def __init__(self):
+                self.requests = []
+
+            def stream(self, method, url, headers=None, content=None):
+                self.requests.append((method, url, json.loads(content)))
+                response = FakeStreamResponse()
+
+                class Context:
+                    async def __aenter__(self):
+                        return response
+
+                    async def __aexit__(self, *args):
+                        pass
+
+                return Context()
+
+        http_client = FakeClient()
+        client = RemoteMCPClient("https://browser.example.com", http_client=http_client)
+
+        items = [item async for item in client.stream_tool_call("read", {"path": "/big"})]
+
+        assert items == [{"type": "text", "text": "a" * 50}, {"n": 1.5}]
+        assert http_client.requests == [
+            (
+                "POST",
+                "https://browser.example.com/tools/call",
+                {"name": "read", "arguments": {"path": "/big"}},
+            )
+        ]
+
 
 class TestMCPNamespace:
     """Test MCP namespace helper."""
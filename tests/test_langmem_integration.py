@@ -0,0 +1,59 @@
+"""Tests for how LangMemLearningSystem hands learnings to storage."""
+
+import asyncio
+import logging
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from learning_agent.learning.langmem_integration import LangMemLearningSystem, LearningExtraction
+from learning_agent.learning.vector_storage import VectorLearningStorage
+
+
+class FakeStructuredLLM:
+    """Structured LLM stub that always asks for the learning to be saved."""
+
+    async def ainvoke(self, messages):
+        return LearningExtraction(
+            should_save=True,
+            save_reason="reusable fix",
+            learnings="Retry the request after refreshing the token",
+            confidence_score=0.8,
+        )
+
+
+@pytest.fixture
+def learning_system(monkeypatch):
+    """Learning system with a stubbed LLM and a storage write buffer."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    system = LangMemLearningSystem.__new__(LangMemLearningSystem)
+    system.structured_llm = FakeStructuredLLM()
+    system.storage = VectorLearningStorage("postgresql://unused")
+    system._logger = logging.getLogger(__name__)
+    return system
+
+
+@pytest.mark.asyncio
+async def test_learnings_are_buffered_into_one_bulk_write(learning_system) -> None:
+    """Learnings finishing together are stored with one batched write."""
+
+    bulk_writes: list[list[str]] = []
+
+    async def fake_store_memories_bulk(memories):
+        bulk_writes.append([memory["id"] for memory in memories])
+        return [memory["id"] for memory in memories]
+
+    learning_system.storage.store_memories_bulk = fake_store_memories_bulk
+    messages = [HumanMessage(content="call the API"), AIMessage(content="401, retrying")]
+    metadata = {"outcome": "failure", "has_error": True}
+
+    await asyncio.gather(
+        learning_system._process_and_store_memory(messages, dict(metadata)),
+        learning_system._process_and_store_memory(messages, dict(metadata)),
+    )
+    assert bulk_writes == []
+
+    await learning_system.storage.close()
+
+    assert len(bulk_writes) == 1
+    assert len(set(bulk_writes[0])) == 2
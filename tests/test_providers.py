@@ -0,0 +1,109 @@
+"""Unit tests for the provider factories."""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from learning_agent.providers import embedding_factory, llm_factory
+
+
+def _llm_config(**overrides):
+    values = {
+        "llm_provider": "openai",
+        "llm_model": "gpt-4o-mini",
+        "llm_temperature": 0.0,
+        "llm_max_tokens": 256,
+        "openai_api_key": "sk-test",
+        "anthropic_api_key": None,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture
+def fake_init_chat_model(monkeypatch):
+    """Record init_chat_model calls and start from an empty model cache."""
+    calls: list[dict] = []
+
+    def fake(**kwargs):
+        calls.append(kwargs)
+        return object()
+
+    monkeypatch.setattr(llm_factory, "init_chat_model", fake)
+    monkeypatch.setattr(llm_factory, "_CHAT_MODELS", {})
+    return calls
+
+
+def test_get_chat_model_shares_instance_for_identical_settings(fake_init_chat_model) -> None:
+    """Equal settings reuse one model; a different model name builds a new one."""
+
+    first = llm_factory.get_chat_model(_llm_config())
+    second = llm_factory.get_chat_model(_llm_config())
+    other = llm_factory.get_chat_model(_llm_config(llm_model="gpt-4o"))
+
+    assert first is second
+    assert other is not first
+    assert len(fake_init_chat_model) == 2
+
+
+def test_chat_model_cache_key_does_not_hold_api_key(fake_init_chat_model) -> None:
+    """API keys are only kept in the cache key as digests."""
+
+    llm_factory.get_chat_model(_llm_config(openai_api_key="sk-secret"))
+
+    (cache_key,) = llm_factory._CHAT_MODELS
+    assert "sk-secret" not in cache_key
+
+
+def test_get_embeddings_reuses_instance_for_identical_settings(monkeypatch) -> None:
+    """Embeddings are built once per configuration, e.g. loading a local model once."""
+
+    built: list[object] = []
+
+    def fake_build(config):
+        built.append(config)
+        return object()
+
+    monkeypatch.setattr(embedding_factory, "_build_embeddings", fake_build)
+    monkeypatch.setattr(embedding_factory, "_EMBEDDINGS", {})
+    config = SimpleNamespace(embedding_provider="huggingface", embedding_model=None)
+
+    first = embedding_factory.get_embeddings(config)
+    second = embedding_factory.get_embeddings(config)
+    other = embedding_factory.get_embeddings(
+        SimpleNamespace(embedding_provider="huggingface", embedding_model="other-model")
+    )
+
+    assert first is second
+    assert other is not first
+    assert len(built) == 2
+
+
+def test_get_embeddings_builds_once_under_concurrent_callers(monkeypatch) -> None:
+    """Threads racing on an empty cache share a single construction."""
+
+    built: list[object] = []
+    gate = threading.Barrier(4)
+
+    def fake_build(config):
+        built.append(config)
+        return object()
+
+    monkeypatch.setattr(embedding_factory, "_build_embeddings", fake_build)
+    monkeypatch.setattr(embedding_factory, "_EMBEDDINGS", {})
+    config = SimpleNamespace(embedding_provider="huggingface", embedding_model=None)
+    results: list[object] = []
+
+    def worker() -> None:
+        gate.wait()
+        results.append(embedding_factory.get_embeddings(config))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(built) == 1
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,248 @@
+"""Unit tests for VectorLearningStorage helpers that do not need a database."""
+
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from learning_agent.learning.vector_storage import (
+    VectorLearningStorage,
+    _decode_halfvec,
+    _decode_jsonb,
+    _embedding_key,
+    _encode_halfvec,
+    _encode_jsonb,
+    _pack_halfvec,
+    _select_columns,
+    configure_hnsw_params,
+)
+
+
+class FakeEmbeddings:
+    """Embeddings stub that records every batched request."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    """Storage instance wired to the fake embeddings client."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    instance = VectorLearningStorage("postgresql://unused")
+    instance.embeddings = FakeEmbeddings()  # type: ignore[assignment]
+    return instance
+
+
+@pytest.mark.asyncio
+async def test_embed_memories_uses_single_batched_request(storage) -> None:
+    """Task and content embeddings for all memories share one request."""
+
+    memories = [
+        {"task": "parse csv", "reflection": "use csv module"},
+        {"reflection": "no task text"},
+    ]
+
+    embedded = await storage._embed_memories(memories)
+
+    assert storage.embeddings.calls == [
+        ["parse csv use csv module", "parse csv", "no task text"],
+    ]
+    assert embedded == [
+        ([float(len("parse csv use csv module"))], [float(len("parse csv"))]),
+        ([float(len("no task text"))], None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_embed_memories_reuses_task_embedding_for_task_only_memory(storage) -> None:
+    """A memory whose content is just its task text is embedded once."""
+
+    embedded = await storage._embed_memories([{"task": "parse csv"}])
+
+    assert storage.embeddings.calls == [["parse csv"]]
+    assert embedded == [([float(len("parse csv"))], [float(len("parse csv"))])]
+
+
+def test_embedding_key_depends_on_model() -> None:
+    """Switching embedding models never reuses vectors cached for the old one."""
+
+    key = _embedding_key("text-embedding-3-small", "parse csv")
+
+    assert key == _embedding_key("text-embedding-3-small", "parse csv")
+    assert key != _embedding_key("text-embedding-3-large", "parse csv")
+
+
+def test_configure_hnsw_params_scales_with_table_size() -> None:
+    """Small tables keep pgvector defaults; large tables get a denser graph."""
+
+    assert configure_hnsw_params(0) == {"m": 16, "ef_construction": 64, "ef_search": 40}
+
+    large = configure_hnsw_params(1_000_000)
+    assert large["m"] > 16
+    assert large["ef_construction"] > 64
+    assert large["ef_search"] > 40
+
+
+def test_jsonb_codec_round_trips_binary_payload() -> None:
+    """The JSONB codec writes the version byte and strips it again on decode."""
+
+    payload = {"redundancies": ["read file twice"], "score": 0.5}
+    encoded = _encode_jsonb(payload)
+
+    assert encoded[:1] == b"\x01"
+    assert _decode_jsonb(encoded) == payload
+
+
+def test_select_columns_defaults_to_narrow_projection() -> None:
+    """Wide columns are opt-in, nullable ones get defaults, unknown names are rejected."""
+
+    assert _select_columns(None) == "id, task, reflection, timestamp"
+    assert _select_columns(["narrative", "task"]) == "id, task, narrative"
+    assert _select_columns(["metadata", "confidence_score"]) == (
+        "id, COALESCE(confidence_score, 0.5) AS confidence_score, "
+        "COALESCE(metadata, '{}'::jsonb) AS metadata"
+    )
+
+    with pytest.raises(ValueError, match="embedding"):
+        _select_columns(["task", "embedding"])
+
+
+def test_memory_from_row_only_stringifies_id() -> None:
+    """Decoded JSONB and timestamps pass through; the UUID id becomes a string."""
+
+    memory_id = uuid4()
+    timestamp = datetime(2025, 1, 2, 3, 4, 5)
+    row = {"id": memory_id, "timestamp": timestamp, "metadata": {"k": "v"}}
+
+    memory = VectorLearningStorage._memory_from_row(row)
+
+    assert memory == {"id": str(memory_id), "timestamp": timestamp, "metadata": {"k": "v"}}
+
+
+def test_halfvec_codec_round_trips_and_passes_packed_bytes_through() -> None:
+    """Lists are packed to the halfvec wire format; pre-packed bytes are sent as-is."""
+
+    values = [0.5, -0.25, 1.0]
+    packed = _pack_halfvec(values)
+
+    assert packed[:4] == b"\x00\x03\x00\x00"
+    assert _encode_halfvec(packed) is packed
+    assert _encode_halfvec(values) == packed
+    assert _decode_halfvec(packed) == values
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_flush_in_progress(storage) -> None:
+    """Closing while a batch is being written neither cancels nor drops it."""
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+    stored: list[list[str]] = []
+
+    async def slow_store(memories):
+        started.set()
+        await release.wait()
+        stored.append([memory["id"] for memory in memories])
+        return [memory["id"] for memory in memories]
+
+    storage.store_memories_bulk = slow_store
+    memory_id = await storage.queue_memory({"task": "parse csv"})
+    await started.wait()
+
+    closing = asyncio.create_task(storage.close())
+    await asyncio.sleep(0)
+    release.set()
+    await closing
+
+    assert stored == [[memory_id]]
+    assert storage._queue_buffer == []
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_requeues_batch(storage) -> None:
+    """Rows from a failed write go back to the front of the buffer."""
+
+    async def failing_store(memories):
+        raise ConnectionError("database unavailable")
+
+    storage.store_memories_bulk = failing_store
+    storage._queue_buffer = [{"id": "a"}, {"id": "b"}]
+
+    with pytest.raises(ConnectionError):
+        await storage.flush_queue()
+
+    assert [memory["id"] for memory in storage._queue_buffer] == ["a", "b"]
+
+
+class FakeIndexConnection:
+    """Connection stub returning a fixed index state and recording statements."""
+
+    def __init__(self, state: dict[str, object] | None) -> None:
+        self.state = state
+        self.statements: list[str] = []
+
+    async def fetchrow(self, sql: str, *args: object) -> dict[str, object] | None:
+        return self.state
+
+    async def execute(self, sql: str, *args: object, timeout: float | None = None) -> None:
+        self.statements.append(" ".join(sql.split()))
+
+
+@pytest.mark.asyncio
+async def test_ensure_hnsw_index_rebuilds_invalid_index() -> None:
+    """An index left invalid by a failed concurrent build is replaced in place."""
+
+    params = configure_hnsw_params(0)
+    conn = FakeIndexConnection(
+        {
+            "indexdef": (
+                "CREATE INDEX memories_embedding_idx ON public.memories USING hnsw "
+                "(embedding halfvec_cosine_ops) WITH (m='16', ef_construction='64')"
+            ),
+            "indisvalid": False,
+        }
+    )
+
+    await VectorLearningStorage._ensure_hnsw_index(
+        conn, "memories_embedding_idx", "embedding", params
+    )
+
+    assert conn.statements[0] == "DROP INDEX CONCURRENTLY IF EXISTS memories_embedding_idx"
+    assert conn.statements[-1].startswith(
+        "CREATE INDEX CONCURRENTLY memories_embedding_idx ON memories USING hnsw"
+    )
+    assert not any("RENAME" in statement for statement in conn.statements)
+
+
+@pytest.mark.asyncio
+async def test_maintain_indexes_skips_when_another_process_holds_lock(storage) -> None:
+    """Only the advisory lock holder checks and rebuilds the indexes."""
+
+    class LockedConnection(FakeIndexConnection):
+        async def fetchval(self, sql: str, *args: object) -> object:
+            return False if "pg_try_advisory_lock" in sql else 10
+
+    conn = LockedConnection(None)
+
+    class FakePool:
+        def acquire(self):
+            class Acquire:
+                async def __aenter__(self):
+                    return conn
+
+                async def __aexit__(self, *args):
+                    pass
+
+            return Acquire()
+
+    storage.pool = FakePool()
+
+    await storage.maintain_indexes()
+
+    assert conn.statements == []